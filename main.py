@@ -433,8 +433,9 @@ def generate_theme_css(theme):
     """
     return css
 
-# Apply dynamic theme CSS from theme manager
+# Apply dynamic theme CSS from theme manager, then the shared theme-independent CSS
 st.markdown(theme.get_theme_css(), unsafe_allow_html=True)
+st.markdown(ThemeManager.get_static_css(), unsafe_allow_html=True)
 
 
 # ============================================================================
@@ -781,7 +782,7 @@ def page_home():
     
     if st.session_state.user_id:
         st.markdown(f"""
-        <div class="info-box">
+        <div class="alert-box info-box">
             <strong>Connected as:</strong> <code>{st.session_state.user_id}</code>
         </div>
         """, unsafe_allow_html=True)
@@ -815,7 +816,7 @@ def page_input_health_data():
         return
     
     st.markdown(f"""
-    <div class="info-box">
+    <div class="alert-box info-box">
         <strong>User ID:</strong> <code>{st.session_state.user_id}</code>
     </div>
     """, unsafe_allow_html=True)
@@ -1050,7 +1051,7 @@ def page_health_summary():
         return
     
     st.markdown(f"""
-    <div class="info-box">
+    <div class="alert-box info-box">
         👤 <strong>User ID:</strong> <code>{st.session_state.user_id}</code>
     </div>
     """, unsafe_allow_html=True)
@@ -1060,7 +1061,7 @@ def page_health_summary():
     
     if not user_records:
         st.markdown("""
-        <div class="warning-box">
+        <div class="alert-box warning-box">
             ⚠️ <strong>No health data found.</strong> Please enter your health data first.
         </div>
         """, unsafe_allow_html=True)
@@ -1097,7 +1098,7 @@ def page_health_summary():
     
     if profile.get("medical_conditions", "None") != "None":
         st.markdown(f"""
-        <div class="warning-box">
+        <div class="alert-box warning-box">
             🏥 <strong>Medical Conditions:</strong> {profile['medical_conditions']}
         </div>
         """, unsafe_allow_html=True)
@@ -1195,13 +1196,13 @@ def page_health_summary():
     if profile.get("health_risks"):
         for risk in profile["health_risks"]:
             st.markdown(f"""
-            <div class="danger-box">
+            <div class="alert-box danger-box">
                 ⚠️ {risk}
             </div>
             """, unsafe_allow_html=True)
     else:
         st.markdown("""
-        <div class="success-box">
+        <div class="alert-box success-box">
             ✅ <strong>No major health risks identified!</strong> Keep up the good work!
         </div>
         """, unsafe_allow_html=True)
@@ -1237,7 +1238,7 @@ def page_recommendations():
         return
     
     st.markdown(f"""
-    <div class="info-box">
+    <div class="alert-box info-box">
         👤 <strong>User ID:</strong> <code>{st.session_state.user_id}</code>
     </div>
     """, unsafe_allow_html=True)
@@ -1247,7 +1248,7 @@ def page_recommendations():
     
     if not user_records:
         st.markdown("""
-        <div class="warning-box">
+        <div class="alert-box warning-box">
             ⚠️ <strong>No health data found.</strong> Please enter your health data first.
         </div>
         """, unsafe_allow_html=True)
@@ -1345,13 +1346,13 @@ def page_recommendations():
         for alert in recommendations["health_alerts"]:
             if "✅" in alert:
                 st.markdown(f"""
-                <div class="success-box">
+                <div class="alert-box success-box">
                     {alert}
                 </div>
                 """, unsafe_allow_html=True)
             else:
                 st.markdown(f"""
-                <div class="warning-box">
+                <div class="alert-box warning-box">
                     {alert}
                 </div>
                 """, unsafe_allow_html=True)
@@ -8,6 +8,7 @@ and KMeans clustering for user segmentation
 import json
 import logging
 import os
+import pickle
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 import warnings
@@ -15,13 +16,20 @@ import warnings
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 
+# Optional JIT compiler for the nearest-cluster kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +40,42 @@ logger = logging.getLogger(__name__)
 # Suppress sklearn warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
+# joblib compression for saved models; zlib ships with Python, so every host can load them
+_MODEL_COMPRESS = ('zlib', 3)
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _nearest(centers, x):
+        """Return the index of the center closest to x by squared Euclidean distance"""
+        best = 0
+        best_dist = 0.0
+        for j in range(centers.shape[1]):
+            diff = centers[0, j] - x[j]
+            best_dist += diff * diff
+        for k in range(1, centers.shape[0]):
+            dist = 0.0
+            for j in range(centers.shape[1]):
+                diff = centers[k, j] - x[j]
+                dist += diff * diff
+            if dist < best_dist:
+                best_dist = dist
+                best = k
+        return best
+
+else:
+
+    def _nearest(centers, x):
+        """Return the index of the center closest to x by squared Euclidean distance"""
+        return int(((centers - x) ** 2).sum(axis=1).argmin())
+
+# Values used for missing user features at prediction time
+_FEATURE_DEFAULTS = {'bmi': 25, 'daily_steps': 7000, 'sleep_hours': 7.5, 'water_intake': 2.5, 'age': 35}
+
+# Probability cut-offs and labels matching AIHealthEngine._risk_level
+_RISK_BINS = np.array([0.3, 0.6, 0.8])
+_RISK_LABELS = np.array(["Low", "Moderate", "High", "Critical"])
+
 
 class AIHealthEngine:
     """
@@ -57,6 +101,9 @@ class AIHealthEngine:
         self.feature_scaler = None
         self.cluster_scaler = None
         
+        # Cluster centers of shape (K, p), cached for fast nearest-center lookup
+        self._centers = None
+        
         # Cluster personalization templates
         self.cluster_templates = {}
         
@@ -64,6 +111,10 @@ class AIHealthEngine:
         self.feature_names = ['bmi', 'daily_steps', 'sleep_hours', 'water_intake', 'age']
         self.cluster_feature_names = ['daily_steps', 'bmi', 'sleep_hours', 'water_intake']
         
+        # Warm up the nearest-center kernel so the first assignment doesn't pay for JIT compilation
+        n_features = len(self.cluster_feature_names)
+        _nearest(np.zeros((1, n_features)), np.zeros(n_features))
+        
         logger.info("✅ AI Health Engine initialized")
     
     def prepare_training_data_from_json(self, records_file: str, profiles_file: str) -> Tuple[pd.DataFrame, bool]:
@@ -127,6 +178,9 @@ class AIHealthEngine:
             else:
                 logger.info(f"📊 Loaded {len(df)} user profiles for training")
             
+            # Risk model features are kept as float32, matching the precision sklearn trees split on
+            df = df.astype({feature: np.float32 for feature in self.feature_names})
+            
             return df, True
             
         except Exception as e:
@@ -261,9 +315,11 @@ class AIHealthEngine:
                 X_scaled, y_sleep, test_size=0.2, random_state=42
             )
             
+            # The linear model is fitted in float64; float32 coefficients would make its
+            # probabilities depend on BLAS summation order (single vs batch predictions)
             self.sleep_deficiency_model = LogisticRegression(random_state=42, max_iter=200)
-            self.sleep_deficiency_model.fit(X_train, y_train)
-            sleep_score = self.sleep_deficiency_model.score(X_test, y_test)
+            self.sleep_deficiency_model.fit(X_train.astype(np.float64), y_train)
+            sleep_score = self.sleep_deficiency_model.score(X_test.astype(np.float64), y_test)
             logger.info(f"✅ Sleep Deficiency Model trained (Accuracy: {sleep_score:.2%})")
             
             logger.info("🎓 All predictive models trained successfully!")
@@ -275,7 +331,7 @@ class AIHealthEngine:
     
     def train_clustering(self, df: pd.DataFrame, n_clusters: int = 4) -> bool:
         """
-        Train KMeans clustering for user segmentation and personalization
+        Train mini-batch KMeans clustering for user segmentation and personalization
         
         Args:
             df: Training DataFrame
@@ -294,16 +350,18 @@ class AIHealthEngine:
                     logger.warning(f"⚠️ Missing feature '{feature}', using default")
                     df[feature] = 0
             
-            X_cluster = df[cluster_features].fillna(0)
+            # Clustering stays float64 so the saved model predicts on ordinary float64 input
+            X_cluster = df[cluster_features].fillna(0).astype(np.float64)
             self.cluster_scaler = StandardScaler()
             X_cluster_scaled = self.cluster_scaler.fit_transform(X_cluster)
             
             # Train clustering model
-            self.clustering_model = KMeans(
-                n_clusters=n_clusters, random_state=42, n_init=10
+            self.clustering_model = MiniBatchKMeans(
+                n_clusters=n_clusters, batch_size=min(1024, len(df)), n_init=3, random_state=42
             )
             clusters = self.clustering_model.fit_predict(X_cluster_scaled)
             df['cluster'] = clusters
+            self._centers = np.asarray(self.clustering_model.cluster_centers_, dtype=np.float64)
             
             logger.info(f"✅ Clustering model trained with {n_clusters} lifestyle clusters")
             
@@ -328,12 +386,12 @@ class AIHealthEngine:
         for cluster_id in sorted(df['cluster'].unique()):
             cluster_data = df[df['cluster'] == cluster_id]
             
-            # Calculate cluster characteristics
-            avg_steps = cluster_data['daily_steps'].mean()
-            avg_bmi = cluster_data['bmi'].mean()
-            avg_sleep = cluster_data['sleep_hours'].mean()
-            avg_water = cluster_data['water_intake'].mean()
-            avg_age = cluster_data['age'].mean()
+            # Calculate cluster characteristics (as Python floats so templates stay JSON-serializable)
+            avg_steps = float(cluster_data['daily_steps'].mean())
+            avg_bmi = float(cluster_data['bmi'].mean())
+            avg_sleep = float(cluster_data['sleep_hours'].mean())
+            avg_water = float(cluster_data['water_intake'].mean())
+            avg_age = float(cluster_data['age'].mean())
             
             # Determine cluster profile
             if avg_steps < 5000 and avg_bmi > 27:
@@ -421,11 +479,11 @@ class AIHealthEngine:
         
         try:
             # Extract user features for detailed logging
-            bmi = user_features.get('bmi', 25)
-            steps = user_features.get('daily_steps', 7000)
-            sleep = user_features.get('sleep_hours', 7.5)
-            water = user_features.get('water_intake', 2.5)
-            age = user_features.get('age', 35)
+            bmi = user_features.get('bmi', _FEATURE_DEFAULTS['bmi'])
+            steps = user_features.get('daily_steps', _FEATURE_DEFAULTS['daily_steps'])
+            sleep = user_features.get('sleep_hours', _FEATURE_DEFAULTS['sleep_hours'])
+            water = user_features.get('water_intake', _FEATURE_DEFAULTS['water_intake'])
+            age = user_features.get('age', _FEATURE_DEFAULTS['age'])
             
             logger.info(f"\n📊 Analyzing user health data:")
             logger.info(f"   • Age: {age} years")
@@ -435,7 +493,7 @@ class AIHealthEngine:
             logger.info(f"   • Water Intake: {water:.1f} liters")
             
             # Prepare feature vector
-            feature_vector = np.array([[bmi, steps, sleep, water, age]])
+            feature_vector = np.asarray([bmi, steps, sleep, water, age], dtype=np.float32).reshape(1, -1)
             
             # Scale features
             feature_scaled = self.feature_scaler.transform(feature_vector)
@@ -447,8 +505,9 @@ class AIHealthEngine:
             inactivity_pred = self.inactivity_model.predict(feature_scaled)[0]
             inactivity_prob = self.inactivity_model.predict_proba(feature_scaled)[0][1]
             
-            sleep_pred = self.sleep_deficiency_model.predict(feature_scaled)[0]
-            sleep_prob = self.sleep_deficiency_model.predict_proba(feature_scaled)[0][1]
+            sleep_scaled = feature_scaled.astype(np.float64)
+            sleep_pred = self.sleep_deficiency_model.predict(sleep_scaled)[0]
+            sleep_prob = self.sleep_deficiency_model.predict_proba(sleep_scaled)[0][1]
             
             logger.info(f"\n🎯 ML Risk Predictions:")
             logger.info(f"   • Obesity Risk: {obesity_prob:.1%} {'⚠️ HIGH' if obesity_prob > 0.6 else '✅ LOW'}")
@@ -489,6 +548,44 @@ class AIHealthEngine:
             logger.error(f"❌ Error making predictions: {e}")
             return {}
     
+    def predict_health_risks_batch(self, users: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict health risks for many users with one model call per risk
+        
+        Args:
+            users: DataFrame with one row per user and columns age, bmi, daily_steps,
+                   sleep_hours, water_intake (missing values use the predict_health_risks defaults)
+            
+        Returns:
+            DataFrame indexed like users with <risk>_probability, <risk>_predicted and
+            <risk>_level columns for each risk; no columns if prediction is unavailable
+        """
+        if self.obesity_model is None or self.feature_scaler is None:
+            logger.warning("⚠️ Models not trained. Train models first.")
+            return pd.DataFrame(index=users.index)
+        
+        try:
+            X = users.reindex(columns=self.feature_names).fillna(_FEATURE_DEFAULTS).astype(np.float32)
+            X_scaled = self.feature_scaler.transform(X)
+            
+            results = {}
+            for risk_type, model, X_model in (
+                ('obesity_risk', self.obesity_model, X_scaled),
+                ('inactivity_risk', self.inactivity_model, X_scaled),
+                ('sleep_deficiency_risk', self.sleep_deficiency_model, X_scaled.astype(np.float64)),
+            ):
+                proba = model.predict_proba(X_model)
+                results[f'{risk_type}_probability'] = proba[:, 1]
+                results[f'{risk_type}_predicted'] = model.classes_[proba.argmax(axis=1)].astype(bool)
+                results[f'{risk_type}_level'] = _RISK_LABELS[np.searchsorted(_RISK_BINS, proba[:, 1], side='right')]
+            
+            logger.info(f"✅ Predicted health risks for {len(X)} users")
+            return pd.DataFrame(results, index=users.index)
+            
+        except Exception as e:
+            logger.error(f"❌ Error making batch predictions: {e}")
+            return pd.DataFrame(index=users.index)
+    
     def assign_user_cluster(self, user_features: Dict[str, float]) -> Dict[str, Any]:
         """
         Assign user to a lifestyle cluster
@@ -505,18 +602,20 @@ class AIHealthEngine:
         
         try:
             # Prepare feature vector for clustering
-            feature_vector = np.array([[
+            feature_vector = np.array([
                 user_features.get('daily_steps', 7000),
                 user_features.get('bmi', 25),
                 user_features.get('sleep_hours', 7.5),
                 user_features.get('water_intake', 2.5),
-            ]])
+            ], dtype=np.float64)
             
             # Scale features
-            feature_scaled = self.cluster_scaler.transform(feature_vector)
+            feature_scaled = (feature_vector - self.cluster_scaler.mean_) / self.cluster_scaler.scale_
             
-            # Predict cluster
-            cluster_id = self.clustering_model.predict(feature_scaled)[0]
+            # Nearest cluster center by squared Euclidean distance
+            if self._centers is None:
+                self._centers = np.asarray(self.clustering_model.cluster_centers_, dtype=np.float64)
+            cluster_id = int(_nearest(self._centers, feature_scaled))
             
             # Get cluster template
             template = self.cluster_templates.get(int(cluster_id), {})
@@ -561,29 +660,33 @@ class AIHealthEngine:
         model_dir = model_dir or self.model_dir
         os.makedirs(model_dir, exist_ok=True)
         
+        def dump(model, filename):
+            joblib.dump(model, os.path.join(model_dir, filename),
+                        compress=_MODEL_COMPRESS, protocol=pickle.HIGHEST_PROTOCOL)
+        
         try:
             if self.obesity_model:
-                joblib.dump(self.obesity_model, os.path.join(model_dir, 'obesity_model.joblib'))
+                dump(self.obesity_model, 'obesity_model.joblib')
                 logger.info("💾 Saved obesity_model.joblib")
             
             if self.inactivity_model:
-                joblib.dump(self.inactivity_model, os.path.join(model_dir, 'inactivity_model.joblib'))
+                dump(self.inactivity_model, 'inactivity_model.joblib')
                 logger.info("💾 Saved inactivity_model.joblib")
             
             if self.sleep_deficiency_model:
-                joblib.dump(self.sleep_deficiency_model, os.path.join(model_dir, 'sleep_model.joblib'))
+                dump(self.sleep_deficiency_model, 'sleep_model.joblib')
                 logger.info("💾 Saved sleep_model.joblib")
             
             if self.feature_scaler:
-                joblib.dump(self.feature_scaler, os.path.join(model_dir, 'feature_scaler.joblib'))
+                dump(self.feature_scaler, 'feature_scaler.joblib')
                 logger.info("💾 Saved feature_scaler.joblib")
             
             if self.clustering_model:
-                joblib.dump(self.clustering_model, os.path.join(model_dir, 'clustering_model.joblib'))
+                dump(self.clustering_model, 'clustering_model.joblib')
                 logger.info("💾 Saved clustering_model.joblib")
             
             if self.cluster_scaler:
-                joblib.dump(self.cluster_scaler, os.path.join(model_dir, 'cluster_scaler.joblib'))
+                dump(self.cluster_scaler, 'cluster_scaler.joblib')
                 logger.info("💾 Saved cluster_scaler.joblib")
             
             # Save cluster templates as JSON
@@ -635,6 +738,7 @@ class AIHealthEngine:
             clustering_path = os.path.join(model_dir, 'clustering_model.joblib')
             if os.path.exists(clustering_path):
                 self.clustering_model = joblib.load(clustering_path)
+                self._centers = np.asarray(self.clustering_model.cluster_centers_, dtype=np.float64)
                 logger.info("📂 Loaded clustering_model.joblib")
             
             cluster_scaler_path = os.path.join(model_dir, 'cluster_scaler.joblib')
@@ -85,6 +85,43 @@ class JSONHealthStorage:
             logger.error(f"Error adding health record: {str(e)}")
             return False
     
+    def add_health_records_bulk(self, user_id: str, records: List[Dict[str, Any]]) -> bool:
+        """
+        Add several health records for a user with a single read and write
+        
+        Args:
+            user_id: Unique user identifier
+            records: List of dictionaries containing health metrics
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Read existing records
+            with open(self.user_records_file, 'r') as f:
+                data = json.load(f)
+            
+            # Add all new records with timestamps
+            data["records"].extend(
+                {
+                    "user_id": user_id,
+                    "timestamp": datetime.now().isoformat(),
+                    "data": health_data
+                }
+                for health_data in records
+            )
+            
+            # Write back to file
+            with open(self.user_records_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            
+            logger.info(f"Added {len(records)} health records for user {user_id}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error adding health records: {str(e)}")
+            return False
+    
     def get_user_records(self, user_id: str) -> List[Dict[str, Any]]:
         """
         Retrieve all health records for a specific user
@@ -4,6 +4,8 @@ Provides AI-powered personalization using Google's Generative AI
 """
 
 import os
+import re
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -12,6 +14,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Bullet lines in a Gemini suggestions response (leading/trailing whitespace excluded)
+_SUGGESTION_RE = re.compile(r'^[^\S\n]*([•\-🎯🥗😴💧].*?)[^\S\n]*$', re.MULTILINE)
+
 
 class GeminiHealthAdvisor:
     """Leverages Gemini API for personalized health recommendations"""
@@ -264,12 +269,8 @@ Format as bullet points only, no explanations."""
             
             response = self.model.generate_content(prompt)
             
-            # Parse response into list
-            suggestions = [
-                line.strip() 
-                for line in response.text.split('\n') 
-                if line.strip() and line.strip().startswith(('•', '-', '🎯', '🥗', '😴', '💧'))
-            ]
+            # Parse bullet lines out of the response in a single regex pass
+            suggestions = _SUGGESTION_RE.findall(response.text)
             
             # Combine standard + AI suggestions
             enhanced = standard_recommendations.copy()
@@ -282,13 +283,7 @@ Format as bullet points only, no explanations."""
             return standard_recommendations
 
 
-# Singleton instance
-_gemini_advisor = None
-
-
+@lru_cache(maxsize=1)
 def get_gemini_advisor() -> GeminiHealthAdvisor:
-    """Get or create Gemini advisor instance"""
-    global _gemini_advisor
-    if _gemini_advisor is None:
-        _gemini_advisor = GeminiHealthAdvisor()
-    return _gemini_advisor
+    """Get or create the shared Gemini advisor instance"""
+    return GeminiHealthAdvisor()
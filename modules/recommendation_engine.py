@@ -6,8 +6,11 @@ Also supports Gemini AI for additional enhancement
 """
 
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Mapping
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
 
 from modules.profile_summarizer import HealthProfileSummarizer
 from modules.health_plan_generator import HealthPlanGenerator
@@ -21,13 +24,37 @@ except ImportError:
 # ML Integration
 try:
     from modules.ai_health_engine import AIHealthEngine, AIRecommendationGenerator
+    from sklearn.exceptions import NotFittedError
     ML_AVAILABLE = True
 except ImportError:
+    NotFittedError = ValueError
     ML_AVAILABLE = False
 
+# Errors an ML prediction can raise on bad input or unfitted models
+_ML_ERRORS = (ValueError, NotFittedError, AttributeError)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared read-only defaults for nested plan lookups (avoids per-call allocation)
+_EMPTY: Dict[str, Any] = {}
+_EMPTY_LIST: List[Any] = []
+
+# Fixed health alert messages (shared; callers must treat them as read-only)
+_MEDICAL_ALERTS = (
+    "⚠️ Remember to follow medical treatment and doctor's instructions",
+    "⚠️ Schedule regular medical check-ups",
+)
+_AGE50_ALERTS = (
+    "⚠️ As you age 50+, regular health screenings are important",
+    "⚠️ Consider blood pressure and cholesterol checks annually",
+)
+_AGE65_ALERTS = (
+    "⚠️ Age 65+: Schedule preventive health screenings",
+    "⚠️ Get flu vaccine annually and consider pneumonia vaccine",
+)
+_NO_RISK_ALERTS = ("✅ No major health risks identified. Keep up healthy habits!",)
+
 
 class RecommendationEngine:
     """Generates personalized health recommendations based on user profiles"""
@@ -36,6 +63,7 @@ class RecommendationEngine:
     _ai_engine = None
     _ai_recommendation_generator = None
     _ml_initialized = False
+    _status_cache: Optional[Mapping[str, bool]] = None
     
     @classmethod
     def initialize_ml_engine(cls, data_dir: str = "data", model_dir: str = "models") -> bool:
@@ -114,20 +142,46 @@ class RecommendationEngine:
         except Exception as e:
             logger.error(f"❌ Error initializing ML engine: {e}")
             return False
+        
+        finally:
+            # ML state may have changed; rebuild the status snapshot on next read
+            cls._status_cache = None
     
     @classmethod
-    def get_ml_status(cls) -> Dict[str, Any]:
+    def get_ml_status(cls) -> Mapping[str, bool]:
         """
         Get status of ML engine
         
         Returns:
-            Dictionary with ML status information
+            Read-only mapping with ML status information (cached until the
+            ML engine is re-initialized)
+        """
+        if cls._status_cache is None:
+            cls._status_cache = MappingProxyType({
+                'ml_available': ML_AVAILABLE,
+                'ml_initialized': cls._ml_initialized,
+                'engine': cls._ai_engine is not None,
+                'recommendation_generator': cls._ai_recommendation_generator is not None
+            })
+        return cls._status_cache
+    
+    @staticmethod
+    def _build_features(profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map a health profile onto the feature names used by the ML engine
+        
+        Args:
+            profile: User health profile
+            
+        Returns:
+            Dictionary of ML input features
         """
         return {
-            'ml_available': ML_AVAILABLE,
-            'ml_initialized': cls._ml_initialized,
-            'engine': cls._ai_engine is not None,
-            'recommendation_generator': cls._ai_recommendation_generator is not None
+            'age': profile.get('age', 35),
+            'bmi': profile.get('bmi', 25),
+            'daily_steps': profile.get('average_steps', 7000),
+            'sleep_hours': profile.get('average_sleep_hours', 7.5),
+            'water_intake': profile.get('average_water_intake', 2.5),
         }
     
     @staticmethod
@@ -310,30 +364,25 @@ class RecommendationEngine:
         Returns:
             List of health risk alerts
         """
-        alerts = []
-        health_risks = profile.get("health_risks", [])
-        
         # Add all identified risks
-        for risk in health_risks:
-            alerts.append(f"⚠️ {risk}")
+        alerts = ["⚠️ " + risk for risk in profile.get("health_risks", [])]
         
         # Additional alerts based on medical conditions
         medical = profile.get("medical_conditions", "").lower()
         if medical != "none" and medical.strip():
-            alerts.append(f"⚠️ Remember to follow medical treatment and doctor's instructions")
-            alerts.append(f"⚠️ Schedule regular medical check-ups")
+            alerts.extend(_MEDICAL_ALERTS)
         
         # Age-specific alerts
         age = profile.get("age", 0)
         if age >= 50:
-            alerts.append("⚠️ As you age 50+, regular health screenings are important")
-            alerts.append("⚠️ Consider blood pressure and cholesterol checks annually")
+            alerts.extend(_AGE50_ALERTS)
         
         if age >= 65:
-            alerts.append("⚠️ Age 65+: Schedule preventive health screenings")
-            alerts.append("⚠️ Get flu vaccine annually and consider pneumonia vaccine")
+            alerts.extend(_AGE65_ALERTS)
         
-        return alerts if alerts else ["✅ No major health risks identified. Keep up healthy habits!"]
+        if not alerts:
+            return list(_NO_RISK_ALERTS)
+        return alerts
     
     @classmethod
     def generate_comprehensive_recommendations(
@@ -359,13 +408,7 @@ class RecommendationEngine:
                 logger.info("🤖 Using ML-powered AI recommendations")
                 
                 # Prepare features for ML prediction
-                user_features = {
-                    'age': profile.get('age', 35),
-                    'bmi': profile.get('bmi', 25),
-                    'daily_steps': profile.get('average_steps', 7000),
-                    'sleep_hours': profile.get('average_sleep_hours', 7.5),
-                    'water_intake': profile.get('average_water_intake', 2.5),
-                }
+                user_features = cls._build_features(profile)
                 
                 # Get ML predictions
                 health_risks = cls._ai_engine.predict_health_risks(user_features)
@@ -409,6 +452,57 @@ class RecommendationEngine:
         
         return recommendations
     
+    @classmethod
+    def generate_batch_recommendations(
+        cls,
+        profiles: List[Dict[str, Any]],
+        rows: Optional[List[int]] = None
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Generate rule-based recommendations for many profiles at once
+        Category classification runs as one compiled batch; recommendation strings
+        are only built for the rows that are actually rendered
+        
+        Args:
+            profiles: List of user health profiles
+            rows: Indices of profiles to render (all profiles if None)
+            
+        Returns:
+            List of recommendation dictionaries, one per rendered row
+        """
+        if not profiles:
+            return []
+        
+        # Imported here so loading the recommendation engine doesn't pull in Numba
+        from modules import recommendation_engine_numba as batch_classifier
+        
+        codes = batch_classifier.classify_batch(
+            np.array([p.get('bmi', 0) for p in profiles], dtype=np.float64),
+            np.array([p.get('average_steps', 0) for p in profiles], dtype=np.float64),
+            np.array([p.get('average_sleep_hours', 0) for p in profiles], dtype=np.float64),
+            np.array([p.get('average_water_intake', 0) for p in profiles], dtype=np.float64),
+        )
+        
+        results = []
+        for i in (range(len(profiles)) if rows is None else rows):
+            row = codes[i]
+            profile = {
+                **profiles[i],
+                'activity_level': batch_classifier.ACTIVITY_LEVELS[row[batch_classifier.EXERCISE_COL]],
+                'bmi_category': batch_classifier.BMI_CATEGORIES[row[batch_classifier.DIET_COL]],
+                'sleep_category': batch_classifier.SLEEP_CATEGORIES[row[batch_classifier.SLEEP_COL]],
+                'hydration_level': batch_classifier.HYDRATION_LEVELS[row[batch_classifier.HYDRATION_COL]],
+            }
+            results.append({
+                "exercise": cls.generate_exercise_recommendations(profile),
+                "diet": cls.generate_diet_recommendations(profile),
+                "sleep": cls.generate_sleep_recommendations(profile),
+                "hydration": cls.generate_hydration_reminders(profile),
+                "health_alerts": cls.generate_health_alerts(profile)
+            })
+        
+        return results
+    
     @classmethod
     def get_ml_health_risks(cls, profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -420,21 +514,14 @@ class RecommendationEngine:
         Returns:
             Dictionary with ML-predicted health risks or None if ML unavailable
         """
-        if not cls._ml_initialized or not cls._ai_engine:
+        if not (cls._ml_initialized and cls._ai_engine):
             logger.debug("ML engine not initialized")
             return None
         
+        user_features = cls._build_features(profile)
         try:
-            user_features = {
-                'age': profile.get('age', 35),
-                'bmi': profile.get('bmi', 25),
-                'daily_steps': profile.get('average_steps', 7000),
-                'sleep_hours': profile.get('average_sleep_hours', 7.5),
-                'water_intake': profile.get('average_water_intake', 2.5),
-            }
-            
             return cls._ai_engine.predict_health_risks(user_features)
-        except Exception as e:
+        except _ML_ERRORS as e:
             logger.error(f"Error getting ML health risks: {e}")
             return None
     
@@ -449,20 +536,14 @@ class RecommendationEngine:
         Returns:
             Dictionary with cluster assignment or None if ML unavailable
         """
-        if not cls._ml_initialized or not cls._ai_engine:
+        if not (cls._ml_initialized and cls._ai_engine):
             logger.debug("ML engine not initialized")
             return None
         
+        user_features = cls._build_features(profile)
         try:
-            user_features = {
-                'daily_steps': profile.get('average_steps', 7000),
-                'bmi': profile.get('bmi', 25),
-                'sleep_hours': profile.get('average_sleep_hours', 7.5),
-                'water_intake': profile.get('average_water_intake', 2.5),
-            }
-            
             return cls._ai_engine.assign_user_cluster(user_features)
-        except Exception as e:
+        except _ML_ERRORS as e:
             logger.error(f"Error assigning user cluster: {e}")
             return None
     
@@ -492,27 +573,18 @@ class RecommendationEngine:
             cluster_id = 0
             
             if use_ml_predictions and cls._ml_initialized and cls._ai_engine:
+                user_features = cls._build_features(profile)
                 try:
-                    # Prepare user features
-                    user_features = {
-                        'age': profile.get('age', 35),
-                        'bmi': profile.get('bmi', 25),
-                        'daily_steps': profile.get('average_steps', 7000),
-                        'sleep_hours': profile.get('average_sleep_hours', 7.5),
-                        'water_intake': profile.get('average_water_intake', 2.5),
-                    }
-                    
                     # Get ML predictions
                     health_risks = cls._ai_engine.predict_health_risks(user_features)
                     cluster_assignment = cls._ai_engine.assign_user_cluster(user_features)
-                    
-                    if cluster_assignment:
-                        cluster_id = cluster_assignment.get('cluster_id', 0)
-                        logger.info(f"✅ ML predictions obtained - Cluster {cluster_id}")
-                    
-                except Exception as e:
+                except _ML_ERRORS as e:
                     logger.warning(f"⚠️ ML prediction failed: {e}, using fallback")
                     health_risks = None
+                
+                if cluster_assignment:
+                    cluster_id = cluster_assignment.get('cluster_id', 0)
+                    logger.info(f"✅ ML predictions obtained - Cluster {cluster_id}")
             
             # Generate health plan
             health_plan = HealthPlanGenerator.generate_personalized_health_plan(
@@ -544,15 +616,20 @@ class RecommendationEngine:
             Summary dictionary
         """
         try:
+            metadata = health_plan.get('metadata') or _EMPTY
+            alerts = health_plan.get('alerts') or _EMPTY
+            critical_len = len(alerts.get('critical_alerts') or _EMPTY_LIST)
+            weekly_goals = health_plan.get('weekly_goals') or _EMPTY
+            
             summary = {
-                'cluster': health_plan.get('metadata', {}).get('cluster_name', 'Unknown'),
-                'risk_levels': health_plan.get('metadata', {}).get('risk_summary', {}),
-                'diet_focus': health_plan.get('diet_plan', {}).get('focus_area', ''),
-                'activity_target': health_plan.get('activity_plan', {}).get('daily_target_steps', 0),
-                'sleep_target': health_plan.get('sleep_plan', {}).get('target_sleep_hours', '7-9 hours'),
-                'weekly_goals_count': len(health_plan.get('weekly_goals', {}).get('goals', [])),
-                'critical_alerts': len(health_plan.get('alerts', {}).get('critical_alerts', [])),
-                'has_urgent_actions': len(health_plan.get('alerts', {}).get('critical_alerts', [])) > 0
+                'cluster': metadata.get('cluster_name', 'Unknown'),
+                'risk_levels': metadata.get('risk_summary') or {},
+                'diet_focus': (health_plan.get('diet_plan') or _EMPTY).get('focus_area', ''),
+                'activity_target': (health_plan.get('activity_plan') or _EMPTY).get('daily_target_steps', 0),
+                'sleep_target': (health_plan.get('sleep_plan') or _EMPTY).get('target_sleep_hours', '7-9 hours'),
+                'weekly_goals_count': len(weekly_goals.get('goals') or _EMPTY_LIST),
+                'critical_alerts': critical_len,
+                'has_urgent_actions': critical_len > 0
             }
             return summary
         except Exception as e:
@@ -0,0 +1,108 @@
+"""
+recommendation_engine_numba.py - Batch category classification for recommendations
+Classifies many user profiles at once into the same activity, BMI, sleep and hydration
+buckets used by the rule-based recommendation generators
+Compiled with Numba when available, with a vectorized NumPy fallback otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Column order of the matrix returned by classify_batch
+EXERCISE_COL, DIET_COL, SLEEP_COL, HYDRATION_COL = range(4)
+
+# Category labels indexed by bucket code (must match HealthProfileSummarizer)
+ACTIVITY_LEVELS = ("Sedentary", "Lightly Active", "Moderately Active", "Very Active", "Extremely Active")
+BMI_CATEGORIES = ("Underweight", "Normal Weight", "Overweight", "Obese")
+SLEEP_CATEGORIES = ("Insufficient", "Below Optimal", "Optimal", "Excessive")
+HYDRATION_LEVELS = ("Dehydrated", "Below Recommended", "Adequate", "Well Hydrated")
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, inline='always')
+    def _exercise_bucket(steps):
+        if steps < 3000:
+            return 0
+        elif steps < 7000:
+            return 1
+        elif steps < 10000:
+            return 2
+        elif steps < 15000:
+            return 3
+        return 4
+
+    @njit(cache=True, inline='always')
+    def _diet_bucket(bmi):
+        if bmi < 18.5:
+            return 0
+        elif bmi < 25:
+            return 1
+        elif bmi < 30:
+            return 2
+        return 3
+
+    @njit(cache=True, inline='always')
+    def _sleep_bucket(hours):
+        if hours < 5:
+            return 0
+        elif hours < 7:
+            return 1
+        elif hours <= 9:
+            return 2
+        return 3
+
+    @njit(cache=True, inline='always')
+    def _hydration_bucket(liters):
+        if liters < 1.5:
+            return 0
+        elif liters < 2.0:
+            return 1
+        elif liters <= 3.0:
+            return 2
+        return 3
+
+    @njit(parallel=True, cache=True)
+    def _classify_batch(bmi, steps, sleep, water):
+        n = bmi.shape[0]
+        out = np.empty((n, 4), np.int8)
+        for i in prange(n):
+            out[i, EXERCISE_COL] = _exercise_bucket(steps[i])
+            out[i, DIET_COL] = _diet_bucket(bmi[i])
+            out[i, SLEEP_COL] = _sleep_bucket(sleep[i])
+            out[i, HYDRATION_COL] = _hydration_bucket(water[i])
+        return out
+
+else:
+
+    def _classify_batch(bmi, steps, sleep, water):
+        out = np.empty((bmi.shape[0], 4), np.int8)
+        out[:, EXERCISE_COL] = (steps >= 3000).astype(np.int8) + (steps >= 7000) + (steps >= 10000) + (steps >= 15000)
+        out[:, DIET_COL] = (bmi >= 18.5).astype(np.int8) + (bmi >= 25) + (bmi >= 30)
+        out[:, SLEEP_COL] = (sleep >= 5).astype(np.int8) + (sleep >= 7) + (sleep > 9)
+        out[:, HYDRATION_COL] = (water >= 1.5).astype(np.int8) + (water >= 2.0) + (water > 3.0)
+        return out
+
+
+def classify_batch(bmi: np.ndarray, steps: np.ndarray,
+                   sleep: np.ndarray, water: np.ndarray) -> np.ndarray:
+    """
+    Classify a batch of users into recommendation category buckets
+
+    Args:
+        bmi: BMI values
+        steps: Average daily steps
+        sleep: Average sleep hours
+        water: Average water intake in liters
+
+    Returns:
+        (N, 4) int8 matrix of bucket codes; columns follow EXERCISE_COL..HYDRATION_COL
+        and index into the matching category label tuples
+    """
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in (bmi, steps, sleep, water)]
+    return _classify_batch(*arrays)
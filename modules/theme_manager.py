@@ -5,580 +5,305 @@ Handles light/dark theme switching, persistence, and modular color schemes
 
 import json
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Literal
+from string import Template
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Literal, Tuple
 
 
-class ThemeManager:
-    """Advanced theme manager with local persistence and dynamic switching"""
-    
-    # Theme Color Palettes - Professional Edition
-    LIGHT_THEME = {
-        "name": "Light",
-        "primary": "#1B7426",
-        "secondary": "#0D47A1",
-        "accent": "#E67E22",
-        "success": "#27AE60",
-        "warning": "#F39C12",
-        "danger": "#E74C3C",
-        "info": "#3498DB",
-        "bg_main": "#F8FAFC",
-        "bg_secondary": "#FFFFFF",
-        "bg_tertiary": "#F1F5F9",
-        "text_primary": "#1A202C",
-        "text_secondary": "#718096",
-        "text_muted": "#A0AEC0",
-        "border": "#E2E8F0",
-        "shadow": "rgba(0,0,0,0.08)",
-        "chart_bg": "#FFFFFF",
-        "card_hover": "#F7FAFC",
-        "header_gradient_start": "#1B7426",
-        "header_gradient_end": "#0D47A1",
-        "input_focus_shadow": "rgba(27, 116, 38, 0.1)",
-        "button_hover": "rgba(0,0,0,0.05)",
-    }
-    
-    DARK_THEME = {
-        "name": "Dark",
-        "primary": "#52C77E",
-        "secondary": "#64B5F6",
-        "accent": "#FFB74D",
-        "success": "#66BB6A",
-        "warning": "#FDD835",
-        "danger": "#EF5350",
-        "info": "#42A5F5",
-        "bg_main": "#0F1419",
-        "bg_secondary": "#1E1E2E",
-        "bg_tertiary": "#2A2A3E",
-        "text_primary": "#E8EAED",
-        "text_secondary": "#B0B0B0",
-        "text_muted": "#808080",
-        "border": "#404050",
-        "shadow": "rgba(0,0,0,0.3)",
-        "chart_bg": "#161B22",
-        "card_hover": "#2C2C3C",
-        "header_gradient_start": "#0D5F2F",
-        "header_gradient_end": "#003DA5",
-        "input_focus_shadow": "rgba(82, 199, 126, 0.15)",
-        "button_hover": "rgba(255,255,255,0.1)",
-    }
+# Parsed theme preference per file path, as (mtime_ns, theme name)
+_PREF_CACHE: Dict[str, Tuple[int, str]] = {}
+_PREF_RE = re.compile(rb'\s*\{\s*"theme"\s*:\s*"(\w+)"\s*\}\s*')
 
-    # Modern Professional Theme
-    MODERN_THEME = {
-        "name": "Modern",
-        "primary": "#6366F1",
-        "secondary": "#EC4899",
-        "accent": "#F59E0B",
-        "success": "#10B981",
-        "warning": "#FBBF24",
-        "danger": "#F87171",
-        "info": "#06B6D4",
-        "bg_main": "#F9FAFB",
-        "bg_secondary": "#FFFFFF",
-        "bg_tertiary": "#F3F4F6",
-        "text_primary": "#111827",
-        "text_secondary": "#6B7280",
-        "text_muted": "#9CA3AF",
-        "border": "#E5E7EB",
-        "shadow": "rgba(0,0,0,0.06)",
-        "chart_bg": "#FFFFFF",
-        "card_hover": "#F9FAFB",
-        "header_gradient_start": "#6366F1",
-        "header_gradient_end": "#EC4899",
-        "input_focus_shadow": "rgba(99, 102, 241, 0.1)",
-        "button_hover": "rgba(0,0,0,0.04)",
-    }
+# Patterns used to minify generated CSS
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE_RE = re.compile(r"\s+")
+_CSS_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+# Only whitespace after a colon is dropped: a space before one is a descendant
+# combinator in selectors such as "div :hover"
+_CSS_COLON_RE = re.compile(r":\s+")
 
-    # Nature-inspired Theme
-    NATURE_THEME = {
-        "name": "Nature",
-        "primary": "#059669",
-        "secondary": "#0891B2",
-        "accent": "#D97706",
-        "success": "#16A34A",
-        "warning": "#CA8A04",
-        "danger": "#DC2626",
-        "info": "#0284C7",
-        "bg_main": "#F8FAFC",
-        "bg_secondary": "#FFFFFF",
-        "bg_tertiary": "#F0FDF4",
-        "text_primary": "#1B4332",
-        "text_secondary": "#52796F",
-        "text_muted": "#95B8B1",
-        "border": "#D1FAE5",
-        "shadow": "rgba(5, 150, 105, 0.08)",
-        "chart_bg": "#F0FDF4",
-        "card_hover": "#F0FDF4",
-        "header_gradient_start": "#065F46",
-        "header_gradient_end": "#164E63",
-        "input_focus_shadow": "rgba(5, 150, 105, 0.15)",
-        "button_hover": "rgba(5, 150, 105, 0.05)",
-    }
-    
-    # Themes dictionary
-    THEMES = {
-        "light": LIGHT_THEME,
-        "dark": DARK_THEME,
-        "modern": MODERN_THEME,
-        "nature": NATURE_THEME,
-    }
-    
-    def __init__(self, theme_file: str = "data/theme_preference.json"):
-        """
-        Initialize theme manager
-        
-        Args:
-            theme_file: Path to store theme preference
-        """
-        self.theme_file = theme_file
-        self.current_theme_name = self._load_theme_preference()
-        self.colors = self.THEMES[self.current_theme_name].copy()
-    
-    def _load_theme_preference(self) -> str:
-        """Load user's theme preference from file, default to light"""
-        try:
-            if os.path.exists(self.theme_file):
-                with open(self.theme_file, 'r') as f:
-                    data = json.load(f)
-                    theme_name = data.get("theme", "light")
-                    if theme_name in self.THEMES:
-                        return theme_name
-        except Exception as e:
-            print(f"⚠️ Error loading theme preference: {e}")
-        return "light"
-    
-    def save_theme_preference(self, theme_name: str) -> bool:
-        """
-        Save user's theme preference to file
-        
-        Args:
-            theme_name: Theme name to save ("light" or "dark")
-            
-        Returns:
-            True if save successful, False otherwise
-        """
-        if theme_name not in self.THEMES:
-            return False
-        
-        try:
-            # Create data directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.theme_file) or ".", exist_ok=True)
-            
-            with open(self.theme_file, 'w') as f:
-                json.dump({"theme": theme_name}, f, indent=2)
-            return True
-        except Exception as e:
-            print(f"⚠️ Error saving theme preference: {e}")
-            return False
-    
-    def set_theme(self, theme_name: str) -> bool:
-        """
-        Set active theme and persist preference
-        
-        Args:
-            theme_name: Theme name to set
-            
-        Returns:
-            True if successful
-        """
-        if theme_name not in self.THEMES:
-            return False
-        
-        self.current_theme_name = theme_name
-        self.colors = self.THEMES[theme_name].copy()
-        return self.save_theme_preference(theme_name)
-    
-    def get_theme_name(self) -> str:
-        """Get current theme name"""
-        return self.current_theme_name
-    
-    def is_dark_mode(self) -> bool:
-        """Check if dark mode is active"""
-        return self.current_theme_name == "dark"
-    
-    def get_color(self, color_name: str) -> str:
-        """
-        Get a specific color from current theme
-        
-        Args:
-            color_name: Name of the color
-            
-        Returns:
-            Hex color code
-        """
-        return self.colors.get(color_name, "#000000")
-    
-    def get_colors(self) -> Dict[str, str]:
-        """Get all colors from current theme"""
-        return self.colors.copy()
-    
-    def get_plotly_template(self) -> str:
-        """Get appropriate Plotly template based on current theme"""
-        return "plotly_dark" if self.is_dark_mode() else "plotly"
-    
-    def get_available_themes(self) -> list:
-        """Get list of available theme names"""
-        return list(self.THEMES.keys())
-    
-    def apply_theme_to_plotly(self, fig):
-        """
-        Apply theme colors to Plotly figures
-        
-        Args:
-            fig: Plotly figure object
-            
-        Returns:
-            Updated figure with theme applied
-        """
-        fig.update_layout(
-            template=self.get_plotly_template(),
-            paper_bgcolor=self.get_color("bg_secondary"),
-            plot_bgcolor=self.get_color("chart_bg"),
-            font=dict(color=self.get_color("text_primary")),
-            margin=dict(l=50, r=50, t=50, b=50),
-        )
-        return fig
-    
-    def get_theme_css(self) -> str:
-        """
-        Generate complete theme-aware CSS dynamically with professional styling
-        
-        Returns:
-            CSS string with all theme variables and styles
-        """
-        colors = self.colors
-        
-        css = f"""
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a CSS string"""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_WHITESPACE_RE.sub(" ", css)
+    css = _CSS_PUNCTUATION_RE.sub(r"\1", css)
+    return _CSS_COLON_RE.sub(":", css).strip()
+
+
+# Theme-dependent CSS; $placeholders are keys of the active palette (including rgba variants)
+_CSS_TEMPLATE = Template("""
         <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500;600&display=swap');
-        
-        * {{
-            transition: background-color 0.2s ease, color 0.2s ease, border-color 0.2s ease, box-shadow 0.2s ease;
-        }}
+        /* Theme-switch color transitions, scoped to page-level surfaces only */
+        html, body, .main,
+        [data-testid="stAppViewContainer"],
+        [data-testid="stSidebar"] {
+            transition: background-color 0.2s ease, color 0.2s ease, border-color 0.2s ease;
+        }
         
-        html, body {{
+        html, body {
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            background-color: {colors['bg_main']};
-            color: {colors['text_primary']};
-        }}
+            background-color: ${bg_main};
+            color: ${text_primary};
+        }
         
         /* Root Colors - Dynamically set based on theme */
-        :root {{
-            --primary-color: {colors['primary']};
-            --secondary-color: {colors['secondary']};
-            --accent-color: {colors['accent']};
-            --success-color: {colors['success']};
-            --warning-color: {colors['warning']};
-            --danger-color: {colors['danger']};
-            --info-color: {colors['info']};
-            --light-bg: {colors['bg_main']};
-            --card-bg: {colors['bg_secondary']};
-            --text-primary: {colors['text_primary']};
-            --text-secondary: {colors['text_secondary']};
-            --border-color: {colors['border']};
-            --shadow-color: {colors['shadow']};
-        }}
+        :root {
+            --primary-color: ${primary};
+            --secondary-color: ${secondary};
+            --accent-color: ${accent};
+            --success-color: ${success};
+            --warning-color: ${warning};
+            --danger-color: ${danger};
+            --info-color: ${info};
+            --light-bg: ${bg_main};
+            --card-bg: ${bg_secondary};
+            --text-primary: ${text_primary};
+            --text-secondary: ${text_secondary};
+            --border-color: ${border};
+            --shadow-color: ${shadow};
+        }
         
         /* Main Container */
-        .main {{
-            background-color: {colors['bg_main']};
-            color: {colors['text_primary']};
+        .main {
+            background-color: ${bg_main};
+            color: ${text_primary};
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
+        }
 
         [data-testid="stAppViewContainer"],
         [data-testid="stAppViewContainer"] .main,
-        [data-testid="stAppViewBlockContainer"] {{
-            background-color: {colors['bg_main']} !important;
-            color: {colors['text_primary']} !important;
-        }}
+        [data-testid="stAppViewBlockContainer"] {
+            background-color: ${bg_main} !important;
+            color: ${text_primary} !important;
+        }
 
-        [data-testid="stHeader"] {{
-            background: transparent !important;
-        }}
-        
         /* Professional Header with Enhanced Design */
-        .header-container {{
-            background: linear-gradient(135deg, {colors['header_gradient_start']} 0%, {colors['header_gradient_end']} 100%);
+        .header-container {
+            background: linear-gradient(135deg, ${header_gradient_start} 0%, ${header_gradient_end} 100%);
             padding: 60px 50px;
             border-radius: 20px;
             color: white;
             margin-bottom: 50px;
-            box-shadow: 0 15px 35px {colors['shadow']};
-            transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+            box-shadow: 0 15px 35px ${shadow};
+            transition: box-shadow 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94), transform 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
             position: relative;
             overflow: hidden;
-        }}
-        
-        .header-container::before {{
-            content: '';
-            position: absolute;
-            top: -50%;
-            right: -50%;
-            width: 100%;
-            height: 100%;
-            background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
-            animation: pulse 4s ease-in-out infinite;
-        }}
-        
-        @keyframes pulse {{
-            0%, 100% {{ transform: scale(1); opacity: 1; }}
-            50% {{ transform: scale(1.05); opacity: 0.8; }}
-        }}
-        
-        .header-title {{
-            font-size: 3.2rem;
-            font-weight: 800;
-            margin: 0;
-            color: white;
-            letter-spacing: -0.8px;
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .header-subtitle {{
-            font-size: 1.1rem;
-            font-weight: 400;
-            margin-top: 16px;
-            opacity: 0.95;
-            color: white;
-            line-height: 1.7;
-            position: relative;
-            z-index: 1;
-        }}
+        }
         
         /* Enhanced Card Styling */
-        .metric-card {{
-            background: {colors['bg_secondary']};
+        .metric-card {
+            background: ${bg_secondary};
             padding: 32px;
             border-radius: 16px;
             margin: 16px 0;
-            border-left: 5px solid {colors['primary']};
-            box-shadow: 0 2px 8px {colors['shadow']};
-            border: 1px solid {colors['border']};
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            color: {colors['text_primary']};
-        }}
-        
-        .metric-card:hover {{
-            box-shadow: 0 12px 32px {colors['shadow']};
+            border-left: 5px solid ${primary};
+            box-shadow: 0 2px 8px ${shadow};
+            border: 1px solid ${border};
+            transition: background-color 0.3s cubic-bezier(0.4, 0, 0.2, 1), color 0.3s cubic-bezier(0.4, 0, 0.2, 1), border-color 0.3s cubic-bezier(0.4, 0, 0.2, 1), box-shadow 0.3s cubic-bezier(0.4, 0, 0.2, 1), transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            color: ${text_primary};
+        }
+        
+        .metric-card:hover {
+            box-shadow: 0 12px 32px ${shadow};
             transform: translateY(-4px);
-            background-color: {colors['card_hover']};
-            border-color: {colors['primary']};
-        }}
+            background-color: ${card_hover};
+            border-color: ${primary};
+        }
         
-        .metric-card-success {{
-            border-left-color: {colors['success']};
-        }}
+        .metric-card-success {
+            border-left-color: ${success};
+        }
         
-        .metric-card-success:hover {{
-            box-shadow: 0 12px 32px {self.hex_to_rgba(colors['success'], 0.2)};
-        }}
+        .metric-card-success:hover {
+            box-shadow: 0 12px 32px ${success_rgba_20};
+        }
         
-        .metric-card-info {{
-            border-left-color: {colors['secondary']};
-        }}
+        .metric-card-info {
+            border-left-color: ${secondary};
+        }
         
-        .metric-card-info:hover {{
-            box-shadow: 0 12px 32px {self.hex_to_rgba(colors['secondary'], 0.2)};
-        }}
+        .metric-card-info:hover {
+            box-shadow: 0 12px 32px ${secondary_rgba_20};
+        }
         
-        .metric-card-warning {{
-            border-left-color: {colors['accent']};
-        }}
+        .metric-card-warning {
+            border-left-color: ${accent};
+        }
         
-        .metric-card-warning:hover {{
-            box-shadow: 0 12px 32px {self.hex_to_rgba(colors['accent'], 0.2)};
-        }}
+        .metric-card-warning:hover {
+            box-shadow: 0 12px 32px ${accent_rgba_20};
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 2.5rem;
             font-weight: 800;
-            color: {colors['primary']};
+            color: ${primary};
             margin: 14px 0 10px 0;
             letter-spacing: -1.2px;
             line-height: 1.1;
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             font-size: 0.85rem;
-            color: {colors['text_secondary']};
+            color: ${text_secondary};
             font-weight: 600;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin: 0;
-        }}
+        }
         
-        .metric-unit {{
+        .metric-unit {
             font-size: 0.82rem;
-            color: {colors['text_secondary']};
+            color: ${text_secondary};
             margin-left: 6px;
             opacity: 0.75;
             font-weight: 500;
-        }}
+        }
         
-        /* Enhanced Alert Boxes with improved styling */
-        .info-box {{
-            background: linear-gradient(135deg, {self.hex_to_rgba(colors['info'], 0.08)} 0%, {self.hex_to_rgba(colors['secondary'], 0.04)} 100%);
-            border-left: 4px solid {colors['info']};
+        /* Enhanced Alert Boxes - shared base, color variants below */
+        .alert-box {
             border-radius: 12px;
             padding: 20px 24px;
             margin: 18px 0;
-            color: {colors['text_primary']};
+            color: ${text_primary};
             font-size: 0.95rem;
             line-height: 1.7;
-            transition: all 0.3s ease;
-            border: 1px solid {self.hex_to_rgba(colors['info'], 0.2)};
-        }}
+            transition: background-color 0.3s ease, color 0.3s ease, border-color 0.3s ease, box-shadow 0.3s ease;
+        }
         
-        .info-box:hover {{
-            box-shadow: 0 4px 16px {self.hex_to_rgba(colors['info'], 0.15)};
+        .alert-box:hover {
             border-left-width: 5px;
-        }}
+        }
+        
+        .info-box {
+            background: linear-gradient(135deg, ${info_rgba_08} 0%, ${secondary_rgba_04} 100%);
+            border-left: 4px solid ${info};
+            border: 1px solid ${info_rgba_20};
+        }
+        
+        .info-box:hover {
+            box-shadow: 0 4px 16px ${info_rgba_15};
+        }
+        
+        .warning-box {
+            background: linear-gradient(135deg, ${warning_rgba_10} 0%, ${accent_rgba_04} 100%);
+            border-left: 4px solid ${warning};
+            border: 1px solid ${warning_rgba_20};
+        }
+        
+        .warning-box:hover {
+            box-shadow: 0 4px 16px ${warning_rgba_15};
+        }
+        
+        .success-box {
+            background: linear-gradient(135deg, ${success_rgba_10} 0%, ${info_rgba_04} 100%);
+            border-left: 4px solid ${success};
+            border: 1px solid ${success_rgba_20};
+        }
+        
+        .success-box:hover {
+            box-shadow: 0 4px 16px ${success_rgba_15};
+        }
+        
+        .danger-box {
+            background: linear-gradient(135deg, ${danger_rgba_10} 0%, ${warning_rgba_04} 100%);
+            border-left: 4px solid ${danger};
+            border: 1px solid ${danger_rgba_20};
+        }
+        
+        .danger-box:hover {
+            box-shadow: 0 4px 16px ${danger_rgba_15};
+        }
         
-        .warning-box {{
-            background: linear-gradient(135deg, {self.hex_to_rgba(colors['warning'], 0.1)} 0%, {self.hex_to_rgba(colors['accent'], 0.04)} 100%);
-            border-left: 4px solid {colors['warning']};
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin: 18px 0;
-            color: {colors['text_primary']};
-            font-size: 0.95rem;
-            line-height: 1.7;
-            transition: all 0.3s ease;
-            border: 1px solid {self.hex_to_rgba(colors['warning'], 0.2)};
-        }}
+        /* Section Headers with enhanced styling */
+        .section-header {
+            font-size: 2.2rem;
+            font-weight: 800;
+            color: ${primary};
+            margin: 48px 0 28px 0;
+            padding-bottom: 20px;
+            border-bottom: 3px solid ${primary};
+            letter-spacing: -0.5px;
+        }
         
-        .warning-box:hover {{
-            box-shadow: 0 4px 16px {self.hex_to_rgba(colors['warning'], 0.15)};
-            border-left-width: 5px;
-        }}
-        
-        .success-box {{
-            background: linear-gradient(135deg, {self.hex_to_rgba(colors['success'], 0.1)} 0%, {self.hex_to_rgba(colors['info'], 0.04)} 100%);
-            border-left: 4px solid {colors['success']};
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin: 18px 0;
-            color: {colors['text_primary']};
-            font-size: 0.95rem;
-            line-height: 1.7;
-            transition: all 0.3s ease;
-            border: 1px solid {self.hex_to_rgba(colors['success'], 0.2)};
-        }}
-        
-        .success-box:hover {{
-            box-shadow: 0 4px 16px {self.hex_to_rgba(colors['success'], 0.15)};
-            border-left-width: 5px;
-        }}
-        
-        .danger-box {{
-            background: linear-gradient(135deg, {self.hex_to_rgba(colors['danger'], 0.1)} 0%, {self.hex_to_rgba(colors['warning'], 0.04)} 100%);
-            border-left: 4px solid {colors['danger']};
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin: 18px 0;
-            color: {colors['text_primary']};
-            font-size: 0.95rem;
-            line-height: 1.7;
-            transition: all 0.3s ease;
-            border: 1px solid {self.hex_to_rgba(colors['danger'], 0.2)};
-        }}
-        
-        .danger-box:hover {{
-            box-shadow: 0 4px 16px {self.hex_to_rgba(colors['danger'], 0.15)};
-            border-left-width: 5px;
-        }}
-        
-        /* Section Headers with enhanced styling */
-        .section-header {{
-            font-size: 2.2rem;
-            font-weight: 800;
-            color: {colors['primary']};
-            margin: 48px 0 28px 0;
-            padding-bottom: 20px;
-            border-bottom: 3px solid {colors['primary']};
-            letter-spacing: -0.5px;
-        }}
-        
-        .subsection-header {{
-            font-size: 1.35rem;
-            font-weight: 700;
-            color: {colors['primary']};
-            margin: 28px 0 18px 0;
-            letter-spacing: -0.3px;
-        }}
+        .subsection-header {
+            font-size: 1.35rem;
+            font-weight: 700;
+            color: ${primary};
+            margin: 28px 0 18px 0;
+            letter-spacing: -0.3px;
+        }
         
         /* Professional Tab Styling */
-        .stTabs [data-baseweb="tab-list"] {{
+        .stTabs [data-baseweb="tab-list"] {
             background-color: transparent;
             border-radius: 0;
             padding: 0;
-            border-bottom: 2px solid {colors['border']};
+            border-bottom: 2px solid ${border};
             gap: 0;
-        }}
+        }
         
-        .stTabs [data-baseweb="tab"] {{
+        .stTabs [data-baseweb="tab"] {
             background-color: transparent;
             border-radius: 8px 8px 0 0;
-            color: {colors['text_secondary']};
+            color: ${text_secondary};
             border-bottom: 3px solid transparent;
             border: 1px solid transparent;
             padding: 14px 28px;
             font-weight: 600;
             font-size: 0.95rem;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }}
-        
-        .stTabs [data-baseweb="tab"]:hover {{
-            color: {colors['primary']};
-            background-color: {colors['button_hover']};
-        }}
-        
-        .stTabs [aria-selected="true"] {{
-            border-bottom-color: {colors['primary']} !important;
-            color: {colors['primary']} !important;
-            border-bottom: 3px solid {colors['primary']};
+            transition: background-color 0.3s cubic-bezier(0.4, 0, 0.2, 1), color 0.3s cubic-bezier(0.4, 0, 0.2, 1), border-color 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        }
+        
+        .stTabs [data-baseweb="tab"]:hover {
+            color: ${primary};
+            background-color: ${button_hover};
+        }
+        
+        .stTabs [aria-selected="true"] {
+            border-bottom-color: ${primary} !important;
+            color: ${primary} !important;
+            border-bottom: 3px solid ${primary};
             font-weight: 700;
-        }}
+        }
         
         /* Professional Buttons */
-        .stButton > button {{
-            background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        .stButton > button {
+            background: linear-gradient(135deg, ${primary} 0%, ${secondary} 100%);
             color: white !important;
             border: none !important;
             border-radius: 10px !important;
             font-weight: 700 !important;
             padding: 12px 28px !important;
             font-size: 0.95rem !important;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-            box-shadow: 0 4px 15px {self.hex_to_rgba(colors['primary'], 0.3)} !important;
+            transition: box-shadow 0.3s cubic-bezier(0.4, 0, 0.2, 1), transform 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+            box-shadow: 0 4px 15px ${primary_rgba_30} !important;
             letter-spacing: 0.3px !important;
-        }}
+        }
         
-        .stButton > button:hover {{
-            box-shadow: 0 8px 25px {self.hex_to_rgba(colors['primary'], 0.4)} !important;
+        .stButton > button:hover {
+            box-shadow: 0 8px 25px ${primary_rgba_40} !important;
             transform: translateY(-2px) !important;
-        }}
-        
-        .stButton > button:active {{
-            transform: translateY(0) !important;
-        }}
+        }
         
         /* Enhanced Input Fields */
         .stTextInput > div > div > input,
         .stSelectbox > div > div > select,
         .stNumberInput > div > div > input,
-        .stTextArea > div > div > textarea {{
-            background-color: {colors['bg_secondary']} !important;
-            color: {colors['text_primary']} !important;
-            border: 1.5px solid {colors['border']} !important;
+        .stTextArea > div > div > textarea {
+            background-color: ${bg_secondary} !important;
+            color: ${text_primary} !important;
+            border: 1.5px solid ${border} !important;
             border-radius: 10px !important;
             padding: 14px 16px !important;
             font-size: 0.95rem !important;
-            transition: all 0.2s ease !important;
+            transition: background-color 0.2s ease, color 0.2s ease, border-color 0.2s ease, box-shadow 0.2s ease !important;
             font-family: 'Inter', sans-serif !important;
-        }}
+        }
 
         [data-testid="stTextInput"] input,
         [data-testid="stTextArea"] textarea,
@@ -587,289 +312,703 @@ class ThemeManager:
         [data-baseweb="select"] input,
         [data-baseweb="select"] span,
         [data-baseweb="base-input"] > div,
-        [data-baseweb="input"] > div {{
-            background-color: {colors['bg_secondary']} !important;
-            color: {colors['text_primary']} !important;
-            border-color: {colors['border']} !important;
-        }}
+        [data-baseweb="input"] > div {
+            background-color: ${bg_secondary} !important;
+            color: ${text_primary} !important;
+            border-color: ${border} !important;
+        }
 
         [data-testid="stNumberInput"] button,
-        [data-baseweb="select"] svg {{
-            color: {colors['text_secondary']} !important;
-            fill: {colors['text_secondary']} !important;
-        }}
+        [data-baseweb="select"] svg {
+            color: ${text_secondary} !important;
+            fill: ${text_secondary} !important;
+        }
         
         .stTextInput > div > div > input:focus,
         .stSelectbox > div > div > select:focus,
         .stNumberInput > div > div > input:focus,
-        .stTextArea > div > div > textarea:focus {{
-            border-color: {colors['primary']} !important;
-            box-shadow: 0 0 0 3px {colors['input_focus_shadow']} !important;
-            background-color: {colors['card_hover']} !important;
-        }}
+        .stTextArea > div > div > textarea:focus {
+            border-color: ${primary} !important;
+            box-shadow: 0 0 0 3px ${input_focus_shadow} !important;
+            background-color: ${card_hover} !important;
+        }
 
         [data-baseweb="select"] > div:focus-within,
         [data-baseweb="base-input"] > div:focus-within,
-        [data-baseweb="input"] > div:focus-within {{
-            border-color: {colors['primary']} !important;
-            box-shadow: 0 0 0 3px {colors['input_focus_shadow']} !important;
-        }}
+        [data-baseweb="input"] > div:focus-within {
+            border-color: ${primary} !important;
+            box-shadow: 0 0 0 3px ${input_focus_shadow} !important;
+        }
         
         /* Professional Labels */
-        .stLabel > label {{
+        .stLabel > label {
             font-weight: 600 !important;
-            color: {colors['text_primary']} !important;
+            color: ${text_primary} !important;
             font-size: 0.9rem !important;
             margin-bottom: 10px !important;
             letter-spacing: 0.2px !important;
-        }}
+        }
 
         [data-testid="stWidgetLabel"] p,
-        [data-testid="stMetricLabel"] p {{
-            color: {colors['text_secondary']} !important;
+        [data-testid="stMetricLabel"] p {
+            color: ${text_secondary} !important;
             font-weight: 600 !important;
-        }}
+        }
 
-        [data-testid="stMetric"] {{
-            background-color: {colors['bg_secondary']} !important;
-            border: 1px solid {colors['border']} !important;
+        [data-testid="stMetric"] {
+            background-color: ${bg_secondary} !important;
+            border: 1px solid ${border} !important;
             border-radius: 12px !important;
             padding: 12px 14px !important;
-        }}
+        }
 
-        [data-testid="stMetricValue"] {{
-            color: {colors['text_primary']} !important;
-        }}
+        [data-testid="stMetricValue"] {
+            color: ${text_primary} !important;
+        }
 
-        .stAlert {{
-            background-color: {colors['bg_secondary']} !important;
-            border-color: {colors['border']} !important;
-            color: {colors['text_primary']} !important;
-        }}
+        .stAlert {
+            background-color: ${bg_secondary} !important;
+            border-color: ${border} !important;
+            color: ${text_primary} !important;
+        }
         
         /* Divider */
-        .divider {{
+        .divider {
             margin: 36px 0;
             border: none;
             height: 1px;
-            background: linear-gradient(90deg, transparent, {colors['border']} 10%, {colors['border']} 90%, transparent);
-        }}
+            background: linear-gradient(90deg, transparent, ${border} 10%, ${border} 90%, transparent);
+        }
         
         /* Theme Toggle Button */
-        .theme-toggle {{
-            background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%);
+        .theme-toggle {
+            background: linear-gradient(135deg, ${primary} 0%, ${secondary} 100%);
             color: white;
             border: none;
             padding: 12px 20px;
             border-radius: 10px;
             font-weight: 600;
             cursor: pointer;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            box-shadow: 0 4px 15px {self.hex_to_rgba(colors['primary'], 0.3)};
+            transition: box-shadow 0.3s cubic-bezier(0.4, 0, 0.2, 1), transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            box-shadow: 0 4px 15px ${primary_rgba_30};
             margin: 10px 0;
             width: 100%;
             font-size: 0.95rem;
-        }}
+        }
         
-        .theme-toggle:hover {{
-            box-shadow: 0 6px 25px {self.hex_to_rgba(colors['primary'], 0.4)};
+        .theme-toggle:hover {
+            box-shadow: 0 6px 25px ${primary_rgba_40};
             transform: translateY(-2px);
-        }}
+        }
         
-        .theme-indicator {{
+        .theme-indicator {
             display: inline-block;
             width: 12px;
             height: 12px;
             border-radius: 50%;
-            background-color: {colors['primary']};
+            background-color: ${primary};
             margin-right: 8px;
             vertical-align: middle;
             animation: fadeInOut 2s ease-in-out infinite;
-        }}
-        
-        @keyframes fadeInOut {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.6; }}
-        }}
+        }
         
         /* Professional Sidebar */
-        [data-testid="stSidebar"] {{
-            background: {colors['bg_secondary']};
-            border-right: 1px solid {colors['border']};
-        }}
+        [data-testid="stSidebar"] {
+            background: ${bg_secondary};
+            border-right: 1px solid ${border};
+        }
         
-        .sidebar-container {{
-            background: linear-gradient(180deg, {colors['header_gradient_start']} 0%, {colors['header_gradient_end']} 100%);
+        .sidebar-container {
+            background: linear-gradient(180deg, ${header_gradient_start} 0%, ${header_gradient_end} 100%);
             color: white;
             padding: 24px;
             border-radius: 14px;
             margin-bottom: 24px;
-            box-shadow: 0 8px 24px {self.hex_to_rgba(colors['primary'], 0.25)};
-        }}
+            box-shadow: 0 8px 24px ${primary_rgba_25};
+        }
         
-        .sidebar-container h3 {{
-            color: white;
-            margin: 0 0 12px 0;
-            font-weight: 700;
-            font-size: 1.1rem;
-            letter-spacing: -0.3px;
-        }}
-        
-        .user-info {{
+        .user-info {
             background-color: rgba(255,255,255,0.15);
             padding: 16px;
             border-radius: 12px;
             margin: 20px 0;
-            border-left: 4px solid {colors['accent']};
+            border-left: 4px solid ${accent};
             border: 1px solid rgba(255,255,255,0.2);
             color: white;
             backdrop-filter: blur(10px);
-        }}
-        
-        .user-info strong {{
-            color: white;
-            font-weight: 700;
-        }}
+        }
         
-        .user-info code {{
-            color: {colors['accent']};
+        .user-info code {
+            color: ${accent};
             font-weight: 600;
             font-family: 'JetBrains Mono', monospace;
             background: rgba(255,255,255,0.1);
             padding: 2px 6px;
             border-radius: 4px;
-        }}
+        }
         
         /* Chart Container */
-        .chart-container {{
-            background-color: {colors['bg_secondary']};
+        .chart-container {
+            background-color: ${bg_secondary};
             padding: 28px;
             border-radius: 16px;
-            box-shadow: 0 4px 16px {colors['shadow']};
+            box-shadow: 0 4px 16px ${shadow};
             margin: 24px 0;
-            border: 1px solid {colors['border']};
-            transition: all 0.3s ease;
-        }}
+            border: 1px solid ${border};
+            transition: background-color 0.3s ease, border-color 0.3s ease, box-shadow 0.3s ease;
+        }
         
-        .chart-container:hover {{
-            box-shadow: 0 8px 32px {colors['shadow']};
-            border-color: {colors['primary']};
-        }}
+        .chart-container:hover {
+            box-shadow: 0 8px 32px ${shadow};
+            border-color: ${primary};
+        }
         
         /* Professional Text Styling */
-        h1, h2, h3, h4, h5, h6 {{
-            color: {colors['primary']};
+        h1, h2, h3, h4, h5, h6 {
+            color: ${primary};
             font-weight: 800;
             letter-spacing: -0.5px;
             margin: 0;
-        }}
-        
-        h1 {{ font-size: 2.5rem; }}
-        h2 {{ font-size: 2rem; }}
-        h3 {{ font-size: 1.5rem; }}
-        h4 {{ font-size: 1.25rem; }}
-        h5 {{ font-size: 1.1rem; }}
-        h6 {{ font-size: 0.95rem; }}
+        }
         
         /* Code Styling */
-        code {{
-            background-color: {colors['bg_tertiary']};
-            border: 1px solid {colors['border']};
+        code {
+            background-color: ${bg_tertiary};
+            border: 1px solid ${border};
             border-radius: 8px;
             padding: 3px 10px;
-            color: {colors['text_primary']};
+            color: ${text_primary};
             font-family: 'JetBrains Mono', 'Monaco', monospace;
             font-size: 0.88rem;
             font-weight: 500;
-        }}
+        }
         
         /* Streamlit Metric Box */
-        .metric-box {{
-            background-color: {colors['bg_secondary']};
+        .metric-box {
+            background-color: ${bg_secondary};
             padding: 20px;
             border-radius: 12px;
-            border: 1px solid {colors['border']};
-            box-shadow: 0 2px 8px {colors['shadow']};
-        }}
+            border: 1px solid ${border};
+            box-shadow: 0 2px 8px ${shadow};
+        }
+        
+        /* Selection styling */
+        ::selection {
+            background-color: ${primary_rgba_30};
+            color: ${text_primary};
+        }
+        </style>
+        """)
+
+# Theme-independent CSS (fonts, animations, typography scale, responsive layout).
+# Injected after the theme CSS so its media queries override the base rules.
+_STATIC_CSS = """
+        <style>
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500;600&display=swap');
+        
+        [data-testid="stHeader"] {
+            background: transparent !important;
+        }
+        
+        .header-container::before {
+            content: '';
+            position: absolute;
+            top: -50%;
+            right: -50%;
+            width: 100%;
+            height: 100%;
+            background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
+            animation: pulse 4s ease-in-out infinite;
+        }
+        
+        @keyframes pulse {
+            0%, 100% { transform: scale(1); opacity: 1; }
+            50% { transform: scale(1.05); opacity: 0.8; }
+        }
+        
+        .header-title {
+            font-size: 3.2rem;
+            font-weight: 800;
+            margin: 0;
+            color: white;
+            letter-spacing: -0.8px;
+            position: relative;
+            z-index: 1;
+        }
+        
+        .header-subtitle {
+            font-size: 1.1rem;
+            font-weight: 400;
+            margin-top: 16px;
+            opacity: 0.95;
+            color: white;
+            line-height: 1.7;
+            position: relative;
+            z-index: 1;
+        }
+        
+        .stButton > button:active {
+            transform: translateY(0) !important;
+        }
+        
+        @keyframes fadeInOut {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.6; }
+        }
+        
+        .sidebar-container h3 {
+            color: white;
+            margin: 0 0 12px 0;
+            font-weight: 700;
+            font-size: 1.1rem;
+            letter-spacing: -0.3px;
+        }
+        
+        .user-info strong {
+            color: white;
+            font-weight: 700;
+        }
+        
+        h1 { font-size: 2.5rem; }
+        h2 { font-size: 2rem; }
+        h3 { font-size: 1.5rem; }
+        h4 { font-size: 1.25rem; }
+        h5 { font-size: 1.1rem; }
+        h6 { font-size: 0.95rem; }
         
         /* Responsive adjustments */
-        @media (max-width: 1024px) {{
-            .header-container {{
+        @media (max-width: 1024px) {
+            .header-container {
                 padding: 48px 40px;
-            }}
+            }
             
-            .header-title {{
+            .header-title {
                 font-size: 2.8rem;
-            }}
-        }}
+            }
+        }
         
-        @media (max-width: 768px) {{
-            .header-title {{
+        @media (max-width: 768px) {
+            .header-title {
                 font-size: 2rem;
-            }}
+            }
             
-            .header-container {{
+            .header-container {
                 padding: 40px 32px;
-            }}
+            }
             
-            .metric-card {{
+            .metric-card {
                 padding: 24px 28px;
-            }}
+            }
             
-            .metric-value {{
+            .metric-value {
                 font-size: 2rem;
-            }}
+            }
             
-            .metric-label {{
+            .metric-label {
                 font-size: 0.8rem;
-            }}
+            }
             
-            .section-header {{
+            .section-header {
                 font-size: 1.8rem;
-            }}
+            }
             
-            .stButton > button {{
+            .stButton > button {
                 padding: 10px 20px !important;
                 font-size: 0.9rem !important;
-            }}
-        }}
+            }
+        }
         
-        @media (max-width: 480px) {{
-            .header-title {{
+        @media (max-width: 480px) {
+            .header-title {
                 font-size: 1.6rem;
-            }}
+            }
             
-            .header-container {{
+            .header-container {
                 padding: 32px 24px;
-            }}
+            }
             
-            .section-header {{
+            .section-header {
                 font-size: 1.5rem;
-            }}
+            }
             
-            .metric-card {{
+            .metric-card {
                 padding: 18px 20px;
-            }}
+            }
             
-            .metric-value {{
+            .metric-value {
                 font-size: 1.5rem;
-            }}
-        }}
+            }
+        }
         
         /* Smooth scrolling */
-        html {{
+        html {
             scroll-behavior: smooth;
-        }}
+        }
         
-        /* Selection styling */
-        ::selection {{
-            background-color: {self.hex_to_rgba(colors['primary'], 0.3)};
-            color: {colors['text_primary']};
-        }}
         </style>
         """
-        return css
+
+
+class ThemeManager:
+    """Advanced theme manager with local persistence and dynamic switching"""
+    
+    __slots__ = ("theme_file", "current_theme_name", "colors", "_plotly_kwargs", "_saved_theme", "_dir_ready")
+    
+    # Theme Color Palettes - Professional Edition
+    LIGHT_THEME = MappingProxyType({
+        "name": "Light",
+        "primary": "#1B7426",
+        "secondary": "#0D47A1",
+        "accent": "#E67E22",
+        "success": "#27AE60",
+        "warning": "#F39C12",
+        "danger": "#E74C3C",
+        "info": "#3498DB",
+        "bg_main": "#F8FAFC",
+        "bg_secondary": "#FFFFFF",
+        "bg_tertiary": "#F1F5F9",
+        "text_primary": "#1A202C",
+        "text_secondary": "#718096",
+        "text_muted": "#A0AEC0",
+        "border": "#E2E8F0",
+        "shadow": "rgba(0,0,0,0.08)",
+        "chart_bg": "#FFFFFF",
+        "card_hover": "#F7FAFC",
+        "header_gradient_start": "#1B7426",
+        "header_gradient_end": "#0D47A1",
+        "input_focus_shadow": "rgba(27, 116, 38, 0.1)",
+        "button_hover": "rgba(0,0,0,0.05)",
+    })
+    
+    DARK_THEME = MappingProxyType({
+        "name": "Dark",
+        "primary": "#52C77E",
+        "secondary": "#64B5F6",
+        "accent": "#FFB74D",
+        "success": "#66BB6A",
+        "warning": "#FDD835",
+        "danger": "#EF5350",
+        "info": "#42A5F5",
+        "bg_main": "#0F1419",
+        "bg_secondary": "#1E1E2E",
+        "bg_tertiary": "#2A2A3E",
+        "text_primary": "#E8EAED",
+        "text_secondary": "#B0B0B0",
+        "text_muted": "#808080",
+        "border": "#404050",
+        "shadow": "rgba(0,0,0,0.3)",
+        "chart_bg": "#161B22",
+        "card_hover": "#2C2C3C",
+        "header_gradient_start": "#0D5F2F",
+        "header_gradient_end": "#003DA5",
+        "input_focus_shadow": "rgba(82, 199, 126, 0.15)",
+        "button_hover": "rgba(255,255,255,0.1)",
+    })
+
+    # Modern Professional Theme
+    MODERN_THEME = MappingProxyType({
+        "name": "Modern",
+        "primary": "#6366F1",
+        "secondary": "#EC4899",
+        "accent": "#F59E0B",
+        "success": "#10B981",
+        "warning": "#FBBF24",
+        "danger": "#F87171",
+        "info": "#06B6D4",
+        "bg_main": "#F9FAFB",
+        "bg_secondary": "#FFFFFF",
+        "bg_tertiary": "#F3F4F6",
+        "text_primary": "#111827",
+        "text_secondary": "#6B7280",
+        "text_muted": "#9CA3AF",
+        "border": "#E5E7EB",
+        "shadow": "rgba(0,0,0,0.06)",
+        "chart_bg": "#FFFFFF",
+        "card_hover": "#F9FAFB",
+        "header_gradient_start": "#6366F1",
+        "header_gradient_end": "#EC4899",
+        "input_focus_shadow": "rgba(99, 102, 241, 0.1)",
+        "button_hover": "rgba(0,0,0,0.04)",
+    })
+
+    # Nature-inspired Theme
+    NATURE_THEME = MappingProxyType({
+        "name": "Nature",
+        "primary": "#059669",
+        "secondary": "#0891B2",
+        "accent": "#D97706",
+        "success": "#16A34A",
+        "warning": "#CA8A04",
+        "danger": "#DC2626",
+        "info": "#0284C7",
+        "bg_main": "#F8FAFC",
+        "bg_secondary": "#FFFFFF",
+        "bg_tertiary": "#F0FDF4",
+        "text_primary": "#1B4332",
+        "text_secondary": "#52796F",
+        "text_muted": "#95B8B1",
+        "border": "#D1FAE5",
+        "shadow": "rgba(5, 150, 105, 0.08)",
+        "chart_bg": "#F0FDF4",
+        "card_hover": "#F0FDF4",
+        "header_gradient_start": "#065F46",
+        "header_gradient_end": "#164E63",
+        "input_focus_shadow": "rgba(5, 150, 105, 0.15)",
+        "button_hover": "rgba(5, 150, 105, 0.05)",
+    })
+    
+    # Themes dictionary (read-only; palettes are shared, never copied)
+    THEMES = MappingProxyType({
+        "light": LIGHT_THEME,
+        "dark": DARK_THEME,
+        "modern": MODERN_THEME,
+        "nature": NATURE_THEME,
+    })
+    
+    # (color, alpha) pairs rendered as rgba() in the theme CSS, precomputed per palette
+    # and stored as "<color>_rgba_<alpha*100>" keys (e.g. "primary_rgba_30")
+    RGBA_VARIANTS = (
+        ("primary", 0.25), ("primary", 0.3), ("primary", 0.4),
+        ("secondary", 0.04), ("secondary", 0.2),
+        ("accent", 0.04), ("accent", 0.2),
+        ("success", 0.1), ("success", 0.15), ("success", 0.2),
+        ("warning", 0.04), ("warning", 0.1), ("warning", 0.15), ("warning", 0.2),
+        ("danger", 0.1), ("danger", 0.15), ("danger", 0.2),
+        ("info", 0.04), ("info", 0.08), ("info", 0.15), ("info", 0.2),
+    )
+    
+    # Read-only palettes extended with rgba variants, built on first use per theme
+    _palette_cache: Dict[str, Mapping[str, str]] = {}
+    
+    def __init__(self, theme_file: str = "data/theme_preference.json"):
+        """
+        Initialize theme manager
+        
+        Args:
+            theme_file: Path to store theme preference
+        """
+        self.theme_file = theme_file
+        self._saved_theme: Optional[str] = None  # Theme name last known to be on disk
+        self._dir_ready = False  # Set once the preference directory is known to exist
+        self.current_theme_name = self._load_theme_preference()
+        self.colors = _get_palette(self.current_theme_name)
+        self._rebuild_plotly_kwargs()
+    
+    @classmethod
+    def _get_palette(cls, theme_name: str) -> Mapping[str, str]:
+        """
+        Get the read-only palette for a theme, building it on first access
+        
+        Args:
+            theme_name: Theme name
+            
+        Returns:
+            Theme palette including its rgba variants
+        """
+        palette = cls._palette_cache.get(theme_name)
+        if palette is None:
+            palette = MappingProxyType(cls._with_rgba_variants(cls.THEMES[theme_name]))
+            cls._palette_cache[theme_name] = palette
+        return palette
+    
+    @classmethod
+    def _with_rgba_variants(cls, palette: Mapping[str, str]) -> Dict[str, str]:
+        """
+        Copy a theme palette and add its precomputed rgba variants
+        
+        Args:
+            palette: Base theme color palette
+            
+        Returns:
+            Palette extended with "<color>_rgba_<alpha*100>" entries
+        """
+        colors = dict(palette)
+        rgba = cls.hex_to_rgba
+        for key, alpha in cls.RGBA_VARIANTS:
+            colors[f"{key}_rgba_{round(alpha * 100):02d}"] = rgba(palette[key], alpha)
+        return colors
+    
+    def _load_theme_preference(self) -> str:
+        """Load user's theme preference from file, default to light"""
+        try:
+            mtime = os.stat(self.theme_file).st_mtime_ns
+            cached = _PREF_CACHE.get(self.theme_file)
+            if cached is not None and cached[0] == mtime:
+                self._saved_theme = cached[1]
+                return cached[1]
+            
+            # Fast path for the {"theme": "<name>"} shape we write; json for anything else
+            raw = Path(self.theme_file).read_bytes()
+            match = _PREF_RE.fullmatch(raw)
+            if match:
+                theme_name = match.group(1).decode()
+            else:
+                theme_name = json.loads(raw).get("theme", "light")
+            
+            if theme_name in _THEME_NAMES:
+                _PREF_CACHE[self.theme_file] = (mtime, theme_name)
+                self._saved_theme = theme_name
+                return theme_name
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Error loading theme preference: {e}")
+        return "light"
+    
+    def save_theme_preference(self, theme_name: str) -> bool:
+        """
+        Save user's theme preference to file
+        
+        Args:
+            theme_name: Theme name to save ("light" or "dark")
+            
+        Returns:
+            True if save successful, False otherwise
+        """
+        if theme_name not in _THEME_NAMES:
+            return False
+        
+        # Nothing to write if the file already holds this theme
+        if theme_name == self._saved_theme:
+            return True
+        
+        try:
+            # Create data directory if it doesn't exist (once per instance)
+            if not self._dir_ready:
+                os.makedirs(os.path.dirname(self.theme_file) or ".", exist_ok=True)
+                self._dir_ready = True
+            
+            # Write to a temp file and swap it in so a crash never leaves a truncated file
+            tmp_file = self.theme_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({"theme": theme_name}, f, indent=2)
+            os.replace(tmp_file, self.theme_file)
+            self._saved_theme = theme_name
+            return True
+        except Exception as e:
+            print(f"⚠️ Error saving theme preference: {e}")
+            return False
+    
+    def set_theme(self, theme_name: str) -> bool:
+        """
+        Set active theme and persist preference
+        
+        Args:
+            theme_name: Theme name to set
+            
+        Returns:
+            True if successful
+        """
+        if theme_name not in _THEME_NAMES:
+            return False
+        
+        if theme_name == self.current_theme_name:
+            return True
+        
+        self.current_theme_name = theme_name
+        self.colors = _get_palette(theme_name)
+        self._rebuild_plotly_kwargs()
+        return self.save_theme_preference(theme_name)
+    
+    def _rebuild_plotly_kwargs(self):
+        """Precompute the Plotly layout settings for the current theme"""
+        c = self.colors
+        self._plotly_kwargs = {
+            "template": "plotly_dark" if self.current_theme_name == "dark" else "plotly",
+            "paper_bgcolor": c["bg_secondary"],
+            "plot_bgcolor": c["chart_bg"],
+            "font": dict(color=c["text_primary"]),
+            "margin": dict(l=50, r=50, t=50, b=50),
+        }
+    
+    def get_theme_name(self) -> str:
+        """Get current theme name"""
+        return self.current_theme_name
+    
+    def is_dark_mode(self) -> bool:
+        """Check if dark mode is active"""
+        return self.current_theme_name == "dark"
+    
+    def get_color(self, color_name: str) -> str:
+        """
+        Get a specific color from current theme
+        
+        Args:
+            color_name: Name of the color
+            
+        Returns:
+            Hex color code
+        """
+        return self.colors.get(color_name, "#000000")
+    
+    def get_colors(self) -> Dict[str, str]:
+        """Get all colors from current theme"""
+        return dict(self.colors)
+    
+    def get_plotly_template(self) -> str:
+        """Get appropriate Plotly template based on current theme"""
+        return self._plotly_kwargs["template"]
+    
+    def get_available_themes(self) -> list:
+        """Get list of available theme names"""
+        return list(self.THEMES.keys())
+    
+    def apply_theme_to_plotly(self, fig):
+        """
+        Apply theme colors to Plotly figures
+        
+        Args:
+            fig: Plotly figure object
+            
+        Returns:
+            Updated figure with theme applied
+        """
+        fig.update_layout(**self._plotly_kwargs)
+        return fig
+    
+    def get_theme_css(self) -> str:
+        """
+        Generate complete theme-aware CSS dynamically with professional styling
+        
+        Returns:
+            CSS string with all theme variables and styles
+        """
+        return self._build_css(self.current_theme_name)
+    
+    @classmethod
+    def prewarm(cls):
+        """Build and cache the CSS for every theme so no theme switch pays the first-build cost"""
+        cls.get_static_css()
+        for theme_name in cls.THEMES:
+            cls._build_css(theme_name)
+    
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_static_css(cls) -> str:
+        """
+        Get the theme-independent CSS (fonts, animations, responsive rules)
+        
+        Returns:
+            Minified CSS string; inject it after get_theme_css()
+        """
+        return _minify_css(_STATIC_CSS)
+    
+    @classmethod
+    @lru_cache(maxsize=len(THEMES))
+    def _build_css(cls, theme_name: str) -> str:
+        """
+        Build the CSS for a theme (cached process-wide, shared by all instances)
+        
+        Args:
+            theme_name: Theme name to build CSS for
+            
+        Returns:
+            Minified CSS string for the theme
+        """
+        return _minify_css(_CSS_TEMPLATE.substitute(cls._get_palette(theme_name)))
+    
     @staticmethod
+    @lru_cache(maxsize=256)
     def hex_to_rgba(hex_color: str, alpha: float = 0.15) -> str:
         """
         Convert hex color to rgba format
@@ -881,8 +1020,14 @@ class ThemeManager:
         Returns:
             RGBA color string
         """
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
+        r, g, b = bytes.fromhex(hex_color.lstrip('#')[:6])
         return f"rgba({r}, {g}, {b}, {alpha})"
+
+
+# Bound lookups for the hot theme-switch path
+_get_palette = ThemeManager._get_palette
+_THEME_NAMES = frozenset(ThemeManager.THEMES)
+
+# Pre-generate all theme CSS at import (set PREWARM_THEME_CSS=false to opt out, e.g. in tests)
+if os.getenv("PREWARM_THEME_CSS", "true").lower() == "true":
+    ThemeManager.prewarm()
@@ -3,14 +3,58 @@ validators.py - Input validation module
 Validates health data inputs and ensures data integrity
 """
 
-import re
-from datetime import datetime
+from functools import lru_cache
 from typing import Tuple, Optional
 
+import numpy as np
+
+_GENDERS = ("Male", "Female", "Other")
+_VALID_GENDERS = frozenset(_GENDERS)
+_GENDER_ERR = f"Gender must be one of: {', '.join(_GENDERS)}"
+
+
+@lru_cache(maxsize=256)
+def _validate_medical_conditions_cached(conditions: str) -> Tuple[bool, Optional[str]]:
+    """Length check for medical conditions text, memoized for repeated entries"""
+    if len(conditions) > 500:
+        return False, "Medical conditions text is too long (max 500 characters)"
+    
+    return True, None
+
 
 class HealthDataValidator:
     """Validates user health input data with specific rules and constraints"""
     
+    __slots__ = ()
+    
+    @staticmethod
+    def _num(value, lo, hi, type_error: str, range_error: str,
+             convert=float) -> Tuple[bool, Optional[str]]:
+        """
+        Range-check a numeric input, converting it only when it is not already a number
+        
+        Args:
+            value: Raw input value
+            lo: Inclusive lower bound
+            hi: Inclusive upper bound
+            type_error: Message returned when the value cannot be converted
+            range_error: Message returned when the value is out of range
+            convert: Converter used for non-int/float inputs
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        t = type(value)
+        if t is not int and t is not float:
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                return False, type_error
+        
+        if lo <= value <= hi:
+            return True, None
+        return False, range_error
+    
     @staticmethod
     def validate_age(age: int) -> Tuple[bool, Optional[str]]:
         """
@@ -22,22 +66,24 @@ class HealthDataValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not isinstance(age, (int, float)):
-            return False, "Age must be a number"
-        
-        age = int(age)
-        if age < 1 or age > 150:
-            return False, "Age must be between 1 and 150"
-        
-        return True, None
+        t = type(age)
+        if t is float:
+            age = int(age)
+        elif t is not int:
+            # Slow path for subclasses such as numpy.float64 and bool
+            if not isinstance(age, (int, float)):
+                return False, "Age must be a number"
+            age = int(age)
+        
+        # Ints are range-checked as-is; only floats are truncated first
+        if 1 <= age <= 150:
+            return True, None
+        return False, "Age must be between 1 and 150"
     
     @staticmethod
     def validate_gender(gender: str) -> Tuple[bool, Optional[str]]:
         """Validate gender input"""
-        valid_genders = ["Male", "Female", "Other"]
-        if gender not in valid_genders:
-            return False, f"Gender must be one of: {', '.join(valid_genders)}"
-        return True, None
+        return (True, None) if gender in _VALID_GENDERS else (False, _GENDER_ERR)
     
     @staticmethod
     def validate_height(height: float) -> Tuple[bool, Optional[str]]:
@@ -50,78 +96,46 @@ class HealthDataValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        try:
-            height = float(height)
-        except:
-            return False, "Height must be a valid number"
-        
-        if height < 30 or height > 300:
-            return False, "Height must be between 30 and 300 cm"
-        
-        return True, None
+        return HealthDataValidator._num(height, 30, 300, "Height must be a valid number",
+                                        "Height must be between 30 and 300 cm")
     
     @staticmethod
     def validate_weight(weight: float) -> Tuple[bool, Optional[str]]:
         """Validate weight in kg"""
-        try:
-            weight = float(weight)
-        except:
-            return False, "Weight must be a valid number"
-        
-        if weight < 1 or weight > 300:
-            return False, "Weight must be between 1 and 300 kg"
-        
-        return True, None
+        return HealthDataValidator._num(weight, 1, 300, "Weight must be a valid number",
+                                        "Weight must be between 1 and 300 kg")
     
     @staticmethod
     def validate_medical_conditions(conditions: str) -> Tuple[bool, Optional[str]]:
         """Validate medical conditions input"""
-        if not isinstance(conditions, str):
+        if type(conditions) is not str:
             return False, "Medical conditions must be text"
         
-        if len(conditions) > 500:
-            return False, "Medical conditions text is too long (max 500 characters)"
-        
-        return True, None
+        return _validate_medical_conditions_cached(conditions)
     
     @staticmethod
     def validate_steps(steps: int) -> Tuple[bool, Optional[str]]:
         """Validate daily steps"""
-        try:
-            steps = int(steps)
-        except:
-            return False, "Steps must be a whole number"
-        
-        if steps < 0 or steps > 100000:
-            return False, "Steps must be between 0 and 100,000"
-        
-        return True, None
+        if type(steps) is not int:
+            # Fractional step counts are truncated before the range check
+            try:
+                steps = int(steps)
+            except (TypeError, ValueError, OverflowError):
+                return False, "Steps must be a whole number"
+        return HealthDataValidator._num(steps, 0, 100000, "Steps must be a whole number",
+                                        "Steps must be between 0 and 100,000")
     
     @staticmethod
     def validate_sleep_hours(sleep: float) -> Tuple[bool, Optional[str]]:
         """Validate sleep hours (0-24)"""
-        try:
-            sleep = float(sleep)
-        except:
-            return False, "Sleep hours must be a valid number"
-        
-        if sleep < 0 or sleep > 24:
-            return False, "Sleep hours must be between 0 and 24"
-        
-        return True, None
+        return HealthDataValidator._num(sleep, 0, 24, "Sleep hours must be a valid number",
+                                        "Sleep hours must be between 0 and 24")
     
     @staticmethod
     def validate_water_intake(water: float) -> Tuple[bool, Optional[str]]:
         """Validate water intake in liters"""
-        try:
-            water = float(water)
-        except:
-            return False, "Water intake must be a valid number"
-        
-        if water < 0 or water > 20:
-            return False, "Water intake must be between 0 and 20 liters"
-        
-        return True, None
+        return HealthDataValidator._num(water, 0, 20, "Water intake must be a valid number",
+                                        "Water intake must be between 0 and 20 liters")
     
     @staticmethod
     def validate_all_data(age, gender, height, weight, medical_conditions, steps, sleep, water) -> Tuple[bool, Optional[str]]:
@@ -131,20 +145,51 @@ class HealthDataValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        validators = [
-            (age, HealthDataValidator.validate_age),
-            (gender, HealthDataValidator.validate_gender),
-            (height, HealthDataValidator.validate_height),
-            (weight, HealthDataValidator.validate_weight),
-            (medical_conditions, HealthDataValidator.validate_medical_conditions),
-            (steps, HealthDataValidator.validate_steps),
-            (sleep, HealthDataValidator.validate_sleep_hours),
-            (water, HealthDataValidator.validate_water_intake),
-        ]
-        
-        for value, validator_func in validators:
-            is_valid, error_msg = validator_func(value)
-            if not is_valid:
-                return False, error_msg
+        v = HealthDataValidator
+        
+        # Cheapest and most commonly failing checks first: a set lookup for gender,
+        # then plain numeric range checks, and the free-text length check last
+        ok, err = v.validate_gender(gender)
+        if not ok:
+            return False, err
+        ok, err = v.validate_age(age)
+        if not ok:
+            return False, err
+        ok, err = v.validate_height(height)
+        if not ok:
+            return False, err
+        ok, err = v.validate_weight(weight)
+        if not ok:
+            return False, err
+        ok, err = v.validate_steps(steps)
+        if not ok:
+            return False, err
+        ok, err = v.validate_sleep_hours(sleep)
+        if not ok:
+            return False, err
+        ok, err = v.validate_water_intake(water)
+        if not ok:
+            return False, err
+        ok, err = v.validate_medical_conditions(medical_conditions)
+        if not ok:
+            return False, err
         
         return True, None
+    
+    @staticmethod
+    def validate_daily_batch(arr: np.ndarray) -> np.ndarray:
+        """
+        Validate many days of metrics at once
+        
+        Args:
+            arr: (N, 3) array of [steps, sleep_hours, water_intake] rows
+            
+        Returns:
+            Boolean mask of length N, True where every metric in the row is in range
+        """
+        steps, sleep, water = arr[:, 0], arr[:, 1], arr[:, 2]
+        return np.logical_and.reduce([
+            steps >= 0, steps <= 100000,
+            sleep >= 0, sleep <= 24,
+            water >= 0, water <= 20,
+        ])
@@ -3,29 +3,117 @@ quick_start.py - Quick start script to test the system with different user scena
 Run different demonstrations without manual data entry
 """
 
-from modules.data_input import HealthDataCollector
-from modules.file_storage import JSONHealthStorage
-from modules.profile_summarizer import HealthProfileSummarizer
-from modules.recommendation_engine import RecommendationEngine
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+import io
 import json
+import sys
+import threading
 
+_SEP = "=" * 70
+_BANNER = (
+    "\n╔" + "═" * 68 + "╗\n"
+    "║" + "PERSONAL HEALTH COACH AI - QUICK START SCENARIOS".center(68) + "║\n"
+    "╚" + "═" * 68 + "╝\n"
+)
 
-def print_header(title):
+# Scenarios share the JSON data files, so their read-modify-write cycles are serialized
+_storage_lock = threading.Lock()
+
+SCENARIOS = [
+    # Scenario 1: Sedentary Office Worker
+    {
+        'name': "Sedentary Office Worker",
+        'age': 35,
+        'gender': "Male",
+        'height': 175,
+        'weight': 90,
+        'medical': "High cholesterol",
+        'daily_data': {
+            'steps': [2500, 2800, 2200, 3000, 2600],
+            'sleep': [6.5, 6.0, 7.0, 6.5, 5.5],
+            'water': [1.2, 1.0, 1.5, 1.3, 0.9],
+        }
+    },
+    # Scenario 2: Active Fitness Enthusiast
+    {
+        'name': "Active Fitness Enthusiast",
+        'age': 28,
+        'gender': "Female",
+        'height': 168,
+        'weight': 62,
+        'medical': "None",
+        'daily_data': {
+            'steps': [12000, 15000, 11500, 13000, 14200],
+            'sleep': [8.0, 7.5, 8.5, 8.0, 7.5],
+            'water': [3.5, 3.2, 3.8, 3.4, 3.6],
+        }
+    },
+    # Scenario 3: Elderly Person with Health Concerns
+    {
+        'name': "Elderly Person",
+        'age': 68,
+        'gender': "Female",
+        'height': 162,
+        'weight': 72,
+        'medical': "Diabetes, Hypertension",
+        'daily_data': {
+            'steps': [4500, 5000, 4200, 5500, 4800],
+            'sleep': [7.5, 8.0, 7.5, 8.5, 7.5],
+            'water': [2.0, 2.2, 1.8, 2.1, 1.9],
+        }
+    },
+    # Scenario 4: Sleep-Deprived Professional
+    {
+        'name': "Sleep-Deprived Professional",
+        'age': 42,
+        'gender': "Male",
+        'height': 182,
+        'weight': 88,
+        'medical': "Stress",
+        'daily_data': {
+            'steps': [6500, 7000, 6200, 6800, 7200],
+            'sleep': [4.5, 5.0, 4.5, 5.5, 4.0],
+            'water': [2.0, 2.1, 1.9, 2.0, 2.2],
+        }
+    },
+    # Scenario 5: Overweight Individual Starting Fitness Journey
+    {
+        'name': "Fitness Journey Beginner",
+        'age': 45,
+        'gender': "Female",
+        'height': 165,
+        'weight': 95,
+        'medical': "Prediabetes",
+        'daily_data': {
+            'steps': [3200, 3800, 4200, 4500, 3900],
+            'sleep': [7.0, 7.5, 6.5, 7.5, 7.0],
+            'water': [1.5, 1.8, 1.6, 1.9, 1.7],
+        }
+    }
+]
+
+
+def print_header(title, out=None):
     """Print formatted header"""
-    print("\n" + "="*70)
-    print(f"  {title}")
-    print("="*70)
+    (out or sys.stdout).write(f"\n{_SEP}\n  {title}\n{_SEP}\n")
 
 
-def test_scenario(name, age, gender, height, weight, medical, daily_data):
-    """Test a specific user scenario"""
-    print_header(f"SCENARIO: {name}")
-    print(f"\nTesting health coach for: {name}")
-    print(f"Profile: {age}y/o {gender}, {height}cm, {weight}kg")
+def test_scenario(name, age, gender, height, weight, medical, daily_data, collector, storage, out=None):
+    """Test a specific user scenario, writing its report to out (stdout by default)"""
+    import numpy as np
+    from modules.profile_summarizer import HealthProfileSummarizer
+    from modules.recommendation_engine import RecommendationEngine
+    from modules.validators import HealthDataValidator
+    
+    out = out or sys.stdout
+    emit = partial(print, file=out)
+    
+    print_header(f"SCENARIO: {name}", out)
+    emit(f"\nTesting health coach for: {name}")
+    emit(f"Profile: {age}y/o {gender}, {height}cm, {weight}kg")
     
-    collector = HealthDataCollector()
-    storage = JSONHealthStorage(data_dir="data")
     user_id = f"scenario_{name.lower().replace(' ', '_')}"
     
     # Collect user info
@@ -35,153 +123,106 @@ def test_scenario(name, age, gender, height, weight, medical, daily_data):
     )
     
     if not is_valid:
-        print(f"❌ Validation Error: {error}")
+        emit(f"❌ Validation Error: {error}")
         return
     
     # Add multiple days of data
-    print(f"\n📊 Simulating {len(daily_data)} days of health data...")
-    
-    for i, metrics in enumerate(daily_data, 1):
-        is_valid, _, daily_metrics = collector.collect_daily_metrics(
-            daily_steps=metrics['steps'],
-            sleep_hours=metrics['sleep'],
-            water_intake=metrics['water']
-        )
+    steps_col, sleep_col, water_col = daily_data['steps'], daily_data['sleep'], daily_data['water']
+    num_days = len(steps_col)
+    emit(f"\n📊 Simulating {num_days} days of health data...")
+    
+    arr = np.column_stack((steps_col, sleep_col, water_col)).astype(np.float64)
+    valid_rows = HealthDataValidator.validate_daily_batch(arr)
+    
+    new_records = []
+    for steps, sleep, water, in_range in zip(steps_col, sleep_col, water_col, valid_rows):
+        if in_range:
+            # Already certified by the batch check; no need to re-validate
+            daily_metrics = {
+                "daily_steps": int(steps),
+                "sleep_hours": float(sleep),
+                "water_intake_liters": float(water)
+            }
+        else:
+            is_valid, error, daily_metrics = collector.collect_daily_metrics(
+                daily_steps=steps,
+                sleep_hours=sleep,
+                water_intake=water
+            )
+            if not is_valid:
+                emit(f"⚠️ Skipping day: {error}")
+                continue
         
-        if is_valid:
-            record = collector.create_health_record(user_info, daily_metrics)
-            storage.add_health_record(user_id, record)
+        new_records.append(collector.create_health_record(user_info, daily_metrics))
     
-    print(f"✅ Added {len(daily_data)} health records")
+    with _storage_lock:
+        storage.add_health_records_bulk(user_id, new_records)
+    emit(f"✅ Added {len(new_records)} health records")
     
     # Get records and create profile
-    records = storage.get_user_records(user_id)
+    with _storage_lock:
+        records = storage.get_user_records(user_id)
     profile = HealthProfileSummarizer.summarize_from_records(records)
-    storage.save_user_profile(user_id, profile)
+    with _storage_lock:
+        storage.save_user_profile(user_id, profile)
     
     # Display profile
-    print_header(f"HEALTH PROFILE: {name}")
-    print(f"Age: {profile['age']} | Gender: {profile['gender']}")
-    print(f"Height: {profile['height_cm']}cm | Weight: {profile['weight_kg']}kg")
-    print(f"BMI: {profile['bmi']} ({profile['bmi_category']})")
-    print(f"Activity Level: {profile['activity_level']}")
-    print(f"Avg Steps: {int(profile['average_steps']):,}")
-    print(f"Avg Sleep: {profile['average_sleep_hours']}h ({profile['sleep_category']})")
-    print(f"Avg Water: {profile['average_water_intake']}L ({profile['hydration_level']})")
+    print_header(f"HEALTH PROFILE: {name}", out)
+    emit(f"Age: {profile['age']} | Gender: {profile['gender']}")
+    emit(f"Height: {profile['height_cm']}cm | Weight: {profile['weight_kg']}kg")
+    emit(f"BMI: {profile['bmi']} ({profile['bmi_category']})")
+    emit(f"Activity Level: {profile['activity_level']}")
+    emit(f"Avg Steps: {int(profile['average_steps']):,}")
+    emit(f"Avg Sleep: {profile['average_sleep_hours']}h ({profile['sleep_category']})")
+    emit(f"Avg Water: {profile['average_water_intake']}L ({profile['hydration_level']})")
     
     # Generate recommendations
     recommendations = RecommendationEngine.generate_comprehensive_recommendations(profile)
     
-    print_header(f"RECOMMENDATIONS: {name}")
-    print("\n🏃 EXERCISE:")
+    print_header(f"RECOMMENDATIONS: {name}", out)
+    emit("\n🏃 EXERCISE:")
     for rec in recommendations['exercise'][:2]:
-        print(f"  → {rec}")
+        emit(f"  → {rec}")
     
-    print("\n🥗 DIET:")
+    emit("\n🥗 DIET:")
     for rec in recommendations['diet'][:2]:
-        print(f"  → {rec}")
+        emit(f"  → {rec}")
     
     if profile.get('health_risks'):
-        print("\n⚠️ HEALTH ALERTS:")
+        emit("\n⚠️ HEALTH ALERTS:")
         for risk in profile['health_risks']:
-            print(f"  → {risk}")
+            emit(f"  → {risk}")
     else:
-        print("\n✅ No major health risks identified")
+        emit("\n✅ No major health risks identified")
     
-    print(f"\n✓ Scenario '{name}' complete - Data saved for user: {user_id}")
+    emit(f"\n✓ Scenario '{name}' complete - Data saved for user: {user_id}")
     return user_id
 
 
 def main():
     """Run multiple test scenarios"""
-    print("\n" + "╔" + "═"*68 + "╗")
-    print("║" + "PERSONAL HEALTH COACH AI - QUICK START SCENARIOS".center(68) + "║")
-    print("╚" + "═"*68 + "╝")
+    sys.stdout.write(_BANNER)
     
-    # Scenario 1: Sedentary Office Worker
-    test_scenario(
-        name="Sedentary Office Worker",
-        age=35,
-        gender="Male",
-        height=175,
-        weight=90,
-        medical="High cholesterol",
-        daily_data=[
-            {'steps': 2500, 'sleep': 6.5, 'water': 1.2},
-            {'steps': 2800, 'sleep': 6.0, 'water': 1.0},
-            {'steps': 2200, 'sleep': 7.0, 'water': 1.5},
-            {'steps': 3000, 'sleep': 6.5, 'water': 1.3},
-            {'steps': 2600, 'sleep': 5.5, 'water': 0.9},
-        ]
-    )
+    from modules.data_input import HealthDataCollector
+    from modules.file_storage import JSONHealthStorage
     
-    # Scenario 2: Active Fitness Enthusiast
-    test_scenario(
-        name="Active Fitness Enthusiast",
-        age=28,
-        gender="Female",
-        height=168,
-        weight=62,
-        medical="None",
-        daily_data=[
-            {'steps': 12000, 'sleep': 8.0, 'water': 3.5},
-            {'steps': 15000, 'sleep': 7.5, 'water': 3.2},
-            {'steps': 11500, 'sleep': 8.5, 'water': 3.8},
-            {'steps': 13000, 'sleep': 8.0, 'water': 3.4},
-            {'steps': 14200, 'sleep': 7.5, 'water': 3.6},
-        ]
-    )
-    
-    # Scenario 3: Elderly Person with Health Concerns
-    test_scenario(
-        name="Elderly Person",
-        age=68,
-        gender="Female",
-        height=162,
-        weight=72,
-        medical="Diabetes, Hypertension",
-        daily_data=[
-            {'steps': 4500, 'sleep': 7.5, 'water': 2.0},
-            {'steps': 5000, 'sleep': 8.0, 'water': 2.2},
-            {'steps': 4200, 'sleep': 7.5, 'water': 1.8},
-            {'steps': 5500, 'sleep': 8.5, 'water': 2.1},
-            {'steps': 4800, 'sleep': 7.5, 'water': 1.9},
-        ]
-    )
+    # Shared across all scenarios
+    collector = HealthDataCollector()
+    storage = JSONHealthStorage(data_dir="data")
     
-    # Scenario 4: Sleep-Deprived Professional
-    test_scenario(
-        name="Sleep-Deprived Professional",
-        age=42,
-        gender="Male",
-        height=182,
-        weight=88,
-        medical="Stress",
-        daily_data=[
-            {'steps': 6500, 'sleep': 4.5, 'water': 2.0},
-            {'steps': 7000, 'sleep': 5.0, 'water': 2.1},
-            {'steps': 6200, 'sleep': 4.5, 'water': 1.9},
-            {'steps': 6800, 'sleep': 5.5, 'water': 2.0},
-            {'steps': 7200, 'sleep': 4.0, 'water': 2.2},
+    # Scenarios are independent and mostly wait on file I/O, so run them concurrently;
+    # each writes its report to its own buffer, flushed in order once all are done
+    buffers = [io.StringIO() for _ in SCENARIOS]
+    with ThreadPoolExecutor(max_workers=len(SCENARIOS)) as executor:
+        futures = [
+            executor.submit(test_scenario, **scenario, collector=collector, storage=storage, out=buf)
+            for scenario, buf in zip(SCENARIOS, buffers)
         ]
-    )
+        for future in futures:
+            future.result()
     
-    # Scenario 5: Overweight Individual Starting Fitness Journey
-    test_scenario(
-        name="Fitness Journey Beginner",
-        age=45,
-        gender="Female",
-        height=165,
-        weight=95,
-        medical="Prediabetes",
-        daily_data=[
-            {'steps': 3200, 'sleep': 7.0, 'water': 1.5},
-            {'steps': 3800, 'sleep': 7.5, 'water': 1.8},
-            {'steps': 4200, 'sleep': 6.5, 'water': 1.6},
-            {'steps': 4500, 'sleep': 7.5, 'water': 1.9},
-            {'steps': 3900, 'sleep': 7.0, 'water': 1.7},
-        ]
-    )
+    for buf in buffers:
+        sys.stdout.write(buf.getvalue())
     
     # Final Summary
     print_header("QUICK START COMPLETE")
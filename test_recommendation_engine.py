@@ -0,0 +1,75 @@
+"""
+test_recommendation_engine.py - Test suite for batch recommendation generation
+Checks the batch category classifier against the per-profile summarizer rules
+"""
+
+import numpy as np
+import pytest
+
+from modules.profile_summarizer import HealthProfileSummarizer
+from modules.recommendation_engine import RecommendationEngine
+from modules import recommendation_engine_numba as batch_classifier
+
+
+def make_profiles(n: int, seed: int = 0):
+    """Build random profiles, plus one row per category boundary"""
+    rng = np.random.default_rng(seed)
+    bmi = np.concatenate([rng.uniform(14, 45, n), [18.5, 25, 30, 18.5, 25, 30]])
+    steps = np.concatenate([rng.uniform(0, 20000, n), [3000, 7000, 10000, 15000, 0, 20000]])
+    sleep = np.concatenate([rng.uniform(2, 12, n), [5, 7, 9, 9.01, 4.99, 12]])
+    water = np.concatenate([rng.uniform(0.5, 5, n), [1.5, 2.0, 3.0, 3.01, 1.49, 5]])
+    return bmi, steps, sleep, water
+
+
+def test_classify_batch_matches_summarizer():
+    """Test that every batch bucket matches the HealthProfileSummarizer category"""
+    bmi, steps, sleep, water = make_profiles(500)
+    codes = batch_classifier.classify_batch(bmi, steps, sleep, water)
+
+    assert codes.shape == (len(bmi), 4)
+    for i in range(len(bmi)):
+        row = codes[i]
+        assert batch_classifier.BMI_CATEGORIES[row[batch_classifier.DIET_COL]] == \
+            HealthProfileSummarizer.categorize_bmi(bmi[i])
+        assert batch_classifier.ACTIVITY_LEVELS[row[batch_classifier.EXERCISE_COL]] == \
+            HealthProfileSummarizer.calculate_activity_level(steps[i])
+        assert batch_classifier.SLEEP_CATEGORIES[row[batch_classifier.SLEEP_COL]] == \
+            HealthProfileSummarizer.categorize_sleep(sleep[i])
+        assert batch_classifier.HYDRATION_LEVELS[row[batch_classifier.HYDRATION_COL]] == \
+            HealthProfileSummarizer.categorize_hydration(water[i])
+
+
+@pytest.mark.parametrize("rows", [None, [2, 0]], ids=["all", "subset"])
+def test_generate_batch_recommendations(rows):
+    """Test that batch recommendations match the per-profile generators"""
+    bmi, steps, sleep, water = make_profiles(3, seed=1)
+    profiles = [
+        {'age': 40, 'bmi': bmi[i], 'average_steps': steps[i],
+         'average_sleep_hours': sleep[i], 'average_water_intake': water[i]}
+        for i in range(3)
+    ]
+
+    results = RecommendationEngine.generate_batch_recommendations(profiles, rows)
+
+    for result, i in zip(results, range(3) if rows is None else rows):
+        profile = {
+            **profiles[i],
+            'activity_level': HealthProfileSummarizer.calculate_activity_level(steps[i]),
+            'bmi_category': HealthProfileSummarizer.categorize_bmi(bmi[i]),
+            'sleep_category': HealthProfileSummarizer.categorize_sleep(sleep[i]),
+            'hydration_level': HealthProfileSummarizer.categorize_hydration(water[i]),
+        }
+        assert result['exercise'] == RecommendationEngine.generate_exercise_recommendations(profile)
+        assert result['diet'] == RecommendationEngine.generate_diet_recommendations(profile)
+        assert result['sleep'] == RecommendationEngine.generate_sleep_recommendations(profile)
+        assert result['hydration'] == RecommendationEngine.generate_hydration_reminders(profile)
+    assert len(results) == (3 if rows is None else len(rows))
+
+
+def test_generate_batch_recommendations_empty():
+    """Test that an empty batch returns no results"""
+    assert RecommendationEngine.generate_batch_recommendations([]) == []
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,48 @@
+"""
+test_validators.py - Test suite for health data validators
+Checks edge cases of the numeric input validation rules
+"""
+
+import numpy as np
+import pytest
+
+from modules.validators import HealthDataValidator
+
+
+@pytest.mark.parametrize("steps,expected", [
+    (0, True),
+    (100000, True),
+    # Fractional counts are truncated before the range check
+    (100000.4, True),
+    (-0.5, True),
+    ("8000", True),
+    (100001, False),
+    (-1, False),
+    ("8000.5", False),
+    (float("nan"), False),
+    (float("inf"), False),
+    (None, False),
+])
+def test_validate_steps(steps, expected):
+    """Test step count validation, including float truncation"""
+    assert HealthDataValidator.validate_steps(steps)[0] is expected
+
+
+@pytest.mark.parametrize("age,expected", [
+    (30, True),
+    (30.9, True),
+    # float subclasses take the isinstance fallback
+    (np.float64(30), True),
+    (np.float64(200), False),
+    (0, False),
+    (151, False),
+    ("30", False),
+    (None, False),
+])
+def test_validate_age(age, expected):
+    """Test age validation, including numpy scalars"""
+    assert HealthDataValidator.validate_age(age)[0] is expected
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))